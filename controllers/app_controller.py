@@ -1,7 +1,7 @@
 """Application controller to coordinate between UI and services."""
 
 import threading
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence
 
 from core.pdf_processor import PDFProcessor
 from core.pdf_renderer import PDFRenderer
@@ -25,7 +25,8 @@ class AppController:
         # State variables
         self.current_pdf_path: Optional[str] = None
         self.stopovers: List[Stopover] = []
-        self.found_stopover_codes: Set[str] = set()
+        # Codes of self.stopovers, built once per analysis and shared read-only with the UI
+        self.found_stopover_codes: FrozenSet[str] = frozenset()
         self.pdf_renderer: Optional[PDFRenderer] = None
         self.outlook_connected = False
         self.outlook_user: Optional[str] = None
@@ -42,7 +43,7 @@ class AppController:
         if validate_pdf_file(pdf_path):
             self.current_pdf_path = pdf_path
             self.stopovers.clear()
-            self.found_stopover_codes.clear()
+            self.found_stopover_codes = frozenset()
             self.close_pdf_renderer()
             return True
         return False
@@ -67,7 +68,7 @@ class AppController:
             self.stopovers = self.pdf_processor.analyze_pdf(self.current_pdf_path)
             
             # Extract stopover codes from found stopovers
-            self.found_stopover_codes = {stopover.code for stopover in self.stopovers}
+            self.found_stopover_codes = frozenset(stopover.code for stopover in self.stopovers)
             
             # Update UI in the main thread
             if self.on_status_update:
@@ -181,10 +182,14 @@ class AppController:
         """Check if a stopover code has any email mappings."""
         return self.mapping_service.has_mapping(stopover_code)
     
-    def get_emails_for_stopover(self, stopover_code: str) -> List[str]:
+    def get_emails_for_stopover(self, stopover_code: str) -> Sequence[str]:
         """Get email addresses for a stopover code."""
         return self.mapping_service.get_emails_for_stopover(stopover_code)
     
+    def get_mappings_for_codes(self, stopover_codes: List[str]) -> Dict[str, Sequence[str]]:
+        """Get email addresses for several stopover codes at once (unmapped codes are omitted)."""
+        return self.mapping_service.get_mappings_for_codes(stopover_codes)
+    
     def add_mapping(self, stopover_code: str, email: str) -> bool:
         """Add a new email mapping for a stopover code."""
         return self.mapping_service.add_mapping(stopover_code, email)
@@ -213,9 +218,10 @@ class AppController:
         total_count = len(stopovers)
         
         try:
+            # Resolve every recipient list in one pass instead of one lookup per stopover
+            emails_by_code = self.get_mappings_for_codes([s.code for s in stopovers])
             for stopover in stopovers:
-                # Get emails for this stopover
-                emails = self.get_emails_for_stopover(stopover.code)
+                emails = emails_by_code.get(stopover.code)
                 
                 if emails:
                     # Send email
@@ -259,7 +265,7 @@ class AppController:
         """Clear all application state."""
         self.current_pdf_path = None
         self.stopovers.clear()
-        self.found_stopover_codes.clear()
+        self.found_stopover_codes = frozenset()
         self.close_pdf_renderer()
     
     def destroy(self) -> None:
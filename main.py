@@ -27,4 +27,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Required for worker processes (parallel attachment creation) in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -3,12 +3,44 @@ import os
 import shutil
 import threading
 import sys
+from contextlib import contextmanager
 from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 from datetime import datetime
 
 
+try:
+    import orjson  # type: ignore
+    _ORJSON_AVAILABLE = True
+except Exception:
+    # Optional speed-up; the standard json module is used when orjson is not installed
+    orjson = None  # type: ignore
+    _ORJSON_AVAILABLE = False
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes (orjson when available)."""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _json_dumps(data: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, non-ASCII kept as-is (orjson when available)."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+# Directories already created by _ensure_dir; avoids a makedirs/stat per save
+_ENSURED_DIRS: set = set()
+
+
 def _ensure_dir(path: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    directory = os.path.dirname(path)
+    if directory in _ENSURED_DIRS:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ENSURED_DIRS.add(directory)
 
 
 def _atomic_write_json(path: str, data: Dict[str, Any]) -> None:
@@ -27,8 +59,8 @@ def _atomic_write_json(path: str, data: Dict[str, Any]) -> None:
                 shutil.copy2(path, bak_path)
             except Exception:
                 pass
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps(data))
         # Atomic replace on same filesystem
         os.replace(tmp_path, path)
     finally:
@@ -89,6 +121,11 @@ class ConfigManager:
         # in-memory state
         self._config: Dict[str, Any] = self._default_config()
         self._lock = threading.RLock()
+        # batch(): depth of nested batches and whether a save was skipped meanwhile
+        self._defer = 0
+        self._dirty = False
+        # batch(): notifications held back until the outermost batch exits (kind -> None, ordered)
+        self._pending_emits: Dict[str, None] = {}
 
         # observers
         self._obs_mappings: List[Callable[[Dict[str, List[str]]], None]] = []
@@ -126,18 +163,52 @@ class ConfigManager:
     # Persistence
     def _save(self) -> None:
         with self._lock:
+            if self._defer:
+                # Inside batch(): persist once when the outermost batch exits
+                self._dirty = True
+                return
             try:
                 _atomic_write_json(self.APP_CONFIG_PATH, self._config)
             except Exception:
                 # Avoid raising to keep UI responsive; config remains in memory
                 pass
 
+    @contextmanager
+    def batch(self):
+        """
+        Defer disk persistence and change notifications until the outermost batch exits.
+
+        Setters still update memory immediately. The JSON write is coalesced into a
+        single _save() at the end, and each kind of observer is notified once with the
+        final state (followed by one on_config_changed notification).
+        """
+        with self._lock:
+            self._defer += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._defer -= 1
+                outermost = self._defer == 0
+                flush = outermost and self._dirty
+                if flush:
+                    self._dirty = False
+                pending = list(self._pending_emits) if outermost else []
+                if pending:
+                    self._pending_emits.clear()
+            if flush:
+                self._save()
+            for kind in pending:
+                self._notify(kind)
+            if pending:
+                self._emit_all()
+
     def _load_or_migrate(self) -> None:
         # Try unified file first
         try:
             if os.path.exists(self.APP_CONFIG_PATH):
-                with open(self.APP_CONFIG_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.APP_CONFIG_PATH, "rb") as f:
+                    data = _json_loads(f.read())
                 if isinstance(data, dict):
                     self._config = self._sanitize_loaded_config(data)
                     return
@@ -192,6 +263,13 @@ class ConfigManager:
         except Exception:
             pass
 
+    @staticmethod
+    def _normalize_code(code: Any) -> str:
+        """Canonical stopover code (stripped, upper-case); every key stored in memory has this form."""
+        if type(code) is str and code.isupper() and not code[:1].isspace() and not code[-1:].isspace():
+            return code
+        return str(code).strip().upper()
+
     def _sanitize_loaded_config(self, cfg: Dict[str, Any]) -> Dict[str, Any]:
         # Enforce schema and types, drop deprecated keys
         sanitized = self._default_config()
@@ -200,7 +278,9 @@ class ConfigManager:
         # stopovers
         stopovers = cfg.get("stopovers", [])
         if isinstance(stopovers, list):
-            sanitized["stopovers"] = [str(s) for s in stopovers if isinstance(s, (str, int))]
+            # Codes are normalized on load so readers can rely on canonical keys
+            norm = self._normalize_code
+            sanitized["stopovers"] = list(dict.fromkeys(norm(s) for s in stopovers if isinstance(s, (str, int))))
 
         # mappings
         mappings = cfg.get("mappings", {})
@@ -214,7 +294,7 @@ class ConfigManager:
                         emails = [v]
                     else:
                         emails = []
-                    fixed_map[k] = emails
+                    fixed_map[self._normalize_code(k)] = emails
             sanitized["mappings"] = fixed_map
 
         # templates
@@ -242,7 +322,7 @@ class ConfigManager:
             for k, v in last_sent.items():
                 if isinstance(k, str) and isinstance(v, str):
                     # do a light validation for ISO format; if invalid, ignore
-                    clean_last[k] = v
+                    clean_last[self._normalize_code(k)] = v
             sanitized["last_sent"] = clean_last
 
         return sanitized
@@ -357,36 +437,38 @@ class ConfigManager:
 
     # Notify helpers
     def _emit_mappings(self) -> None:
-        for cb in list(self._obs_mappings):
-            try:
-                cb(self.get_mappings())
-            except Exception:
-                pass
-        self._emit_all()
+        self._emit("mappings")
 
     def _emit_stopovers(self) -> None:
-        for cb in list(self._obs_stopovers):
-            try:
-                cb(self.get_stopovers())
-            except Exception:
-                pass
-        self._emit_all()
+        self._emit("stopovers")
 
     def _emit_templates(self) -> None:
-        for cb in list(self._obs_templates):
-            try:
-                cb(self.get_templates())
-            except Exception:
-                pass
-        self._emit_all()
+        self._emit("templates")
 
     def _emit_last_sent(self) -> None:
-        for cb in list(self._obs_last_sent):
+        self._emit("last_sent")
+
+    def _emit(self, kind: str) -> None:
+        with self._lock:
+            if self._defer:
+                # Inside batch(): notify once when the outermost batch exits
+                self._pending_emits[kind] = None
+                return
+        self._notify(kind)
+        self._emit_all()
+
+    def _notify(self, kind: str) -> None:
+        observers, getter = {
+            "mappings": (self._obs_mappings, self.get_mappings),
+            "stopovers": (self._obs_stopovers, self.get_stopovers),
+            "templates": (self._obs_templates, self.get_templates),
+            "last_sent": (self._obs_last_sent, self.get_last_sent),
+        }[kind]
+        for cb in list(observers):
             try:
-                cb(self.get_last_sent())
+                cb(getter())
             except Exception:
                 pass
-        self._emit_all()
 
     def _emit_all(self) -> None:
         snapshot = self.get_all()
@@ -400,7 +482,7 @@ class ConfigManager:
     def get_all(self) -> Dict[str, Any]:
         with self._lock:
             # deep copy via json round-trip for immutability outside
-            return json.loads(json.dumps(self._config))
+            return _json_loads(_json_dumps(self._config, indent=False))
 
     def get_stopovers(self) -> List[str]:
         with self._lock:
@@ -411,6 +493,16 @@ class ConfigManager:
             # deep copy
             return {k: list(v) for k, v in self._config.get("mappings", {}).items()}
 
+    def stopover_contains(self, code: str) -> bool:
+        """Membership test on the stopovers list without copying it."""
+        with self._lock:
+            return code in self._config.get("stopovers", [])
+
+    def mapping_contains(self, code: str) -> bool:
+        """Membership test on the mappings dict without deep-copying it."""
+        with self._lock:
+            return code in self._config.get("mappings", {})
+
     def get_templates(self) -> Dict[str, str]:
         with self._lock:
             t = self._config.get("templates", {}) or {}
@@ -437,13 +529,14 @@ class ConfigManager:
     def set_stopovers(self, stopovers: List[str]) -> None:
         with self._lock:
             # normalize input
-            desired = [str(s).upper() for s in stopovers]
+            desired = list(dict.fromkeys(self._normalize_code(s) for s in stopovers))
             self._config["stopovers"] = desired
-            # prune mappings/last_sent for non-present stopovers
+            # prune mappings/last_sent for non-present stopovers (stored keys are already canonical)
+            keep = set(desired)
             maps = self._config.get("mappings", {})
-            self._config["mappings"] = {k.upper(): list(v) for k, v in maps.items() if str(k).upper() in desired}
+            self._config["mappings"] = {k: list(v) for k, v in maps.items() if k in keep}
             last = self._config.get("last_sent", {})
-            self._config["last_sent"] = {k.upper(): v for k, v in last.items() if str(k).upper() in desired}
+            self._config["last_sent"] = {k: v for k, v in last.items() if k in keep}
             self._save()
         self._emit_stopovers()
         self._emit_mappings()
@@ -451,7 +544,7 @@ class ConfigManager:
 
     def add_stopover(self, stopover: str) -> None:
         with self._lock:
-            s = str(stopover)
+            s = self._normalize_code(stopover)
             lst = self._config.get("stopovers", [])
             if s not in lst:
                 lst.append(s)
@@ -461,7 +554,7 @@ class ConfigManager:
 
     def remove_stopover(self, stopover: str) -> None:
         with self._lock:
-            s = str(stopover)
+            s = self._normalize_code(stopover)
             lst = self._config.get("stopovers", [])
             if s in lst:
                 lst.remove(s)
@@ -478,7 +571,7 @@ class ConfigManager:
 
     def set_mapping(self, stopover: str, emails: List[str]) -> None:
         with self._lock:
-            s = str(stopover).upper()
+            s = self._normalize_code(stopover)
             ems = [str(e) for e in emails]
             maps = self._config.get("mappings", {})
             maps[s] = ems
@@ -494,7 +587,7 @@ class ConfigManager:
 
     def remove_mapping(self, stopover: str) -> None:
         with self._lock:
-            s = str(stopover)
+            s = self._normalize_code(stopover)
             if s in self._config.get("mappings", {}):
                 self._config["mappings"].pop(s, None)
                 self._save()
@@ -524,7 +617,7 @@ class ConfigManager:
 
     def set_last_sent(self, stopover: str, iso_ts: Optional[str] = None) -> None:
         with self._lock:
-            s = str(stopover).upper()
+            s = self._normalize_code(stopover)
             ts = iso_ts if isinstance(iso_ts, str) and iso_ts else datetime.utcnow().isoformat() + "Z"
             last = self._config.get("last_sent", {})
             last[s] = ts
@@ -532,9 +625,23 @@ class ConfigManager:
             self._save()
         self._emit_last_sent()
 
+    def set_last_sent_many(self, stopovers: List[str], iso_ts: Optional[str] = None) -> None:
+        """Set last_sent for several stopovers at once: one write and one notification."""
+        codes = [self._normalize_code(s) for s in stopovers or []]
+        if not codes:
+            return
+        with self._lock:
+            ts = iso_ts if isinstance(iso_ts, str) and iso_ts else datetime.utcnow().isoformat() + "Z"
+            last = self._config.get("last_sent", {})
+            for s in codes:
+                last[s] = ts
+            self._config["last_sent"] = last
+            self._save()
+        self._emit_last_sent()
+
     def clear_last_sent(self, stopover: str) -> None:
         with self._lock:
-            s = str(stopover)
+            s = self._normalize_code(stopover)
             if s in self._config.get("last_sent", {}):
                 self._config["last_sent"].pop(s, None)
                 self._save()
@@ -564,14 +671,13 @@ Cordialement,"""
         """Return True if normalized code is present in stopovers list."""
         if code is None:
             return False
-        cu = str(code).upper()
-        return cu in self.get_stopovers()
+        return self.stopover_contains(self._normalize_code(code))
 
     def clear_last_sent_normalized(self, code: str) -> None:
         """Uppercase code internally then clear last_sent for that key."""
         if code is None:
             return
-        cu = str(code).upper()
+        cu = self._normalize_code(code)
         # Direct manipulation preserving semantics of clear_last_sent
         with self._lock:
             if cu in self._config.get("last_sent", {}):
@@ -594,15 +700,16 @@ def replace_all_config(stopovers: List[str], mappings: Dict[str, List[str]], las
     """
     mgr = get_config_manager()
     # Normalize input
-    normalized_stopovers = [str(s).upper() for s in (stopovers or [])]
+    norm = ConfigManager._normalize_code
+    normalized_stopovers = list(dict.fromkeys(norm(s) for s in (stopovers or [])))
     normalized_mappings: Dict[str, List[str]] = {}
     for k, v in (mappings or {}).items():
-        ku = str(k).upper()
+        ku = norm(k)
         if ku in normalized_stopovers:
             normalized_mappings[ku] = [str(e) for e in (v or [])]
     normalized_last: Dict[str, str] = {}
     for k, v in (last_sent or {}).items():
-        ku = str(k).upper()
+        ku = norm(k)
         if ku in normalized_stopovers and isinstance(v, str):
             normalized_last[ku] = v
 
@@ -1,27 +1,89 @@
 """Enhanced email service with Outlook account management (uses ConfigManager for templates)."""
 
+import logging
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .config_manager import get_config_manager
 
-try:
-    import win32com.client  # type: ignore
-    import pythoncom  # type: ignore
-    _WIN32COM_AVAILABLE = True
-except Exception as e:
-    # Keep: platform-specific import handling for Windows Outlook integration
-    print(f"[EmailService][DEBUG] pywin32 not available: {e}")
-    win32com = None  # type: ignore
-    pythoncom = None  # type: ignore
-    _WIN32COM_AVAILABLE = False
+logger = logging.getLogger(__name__)
+
+# pywin32 is imported on first use (see _win32com_available): loading it is slow and
+# should not delay the window, while Outlook is only reached later from worker threads
+win32com = None  # type: ignore
+pythoncom = None  # type: ignore
+_WIN32COM_AVAILABLE: Optional[bool] = None
+_win32com_lock = threading.Lock()
+
+
+def _win32com_available() -> bool:
+    """Import pywin32 once (thread-safe) and report whether it is usable."""
+    global win32com, pythoncom, _WIN32COM_AVAILABLE
+    if _WIN32COM_AVAILABLE is None:
+        with _win32com_lock:
+            if _WIN32COM_AVAILABLE is None:
+                try:
+                    import win32com.client  # type: ignore
+                    import pythoncom  # type: ignore
+                    _WIN32COM_AVAILABLE = True
+                except Exception as e:
+                    # Keep: platform-specific import handling for Windows Outlook integration
+                    logger.debug("pywin32 not available: %s", e)
+                    _WIN32COM_AVAILABLE = False
+    return _WIN32COM_AVAILABLE
+
+# MAPI DASL property tags (PT_UNICODE) for batched PropertyAccessor writes
+_PR_SUBJECT_W = "http://schemas.microsoft.com/mapi/proptag/0x0037001F"
+_PR_BODY_W = "http://schemas.microsoft.com/mapi/proptag/0x1000001F"
+
+
+def _dispatch_outlook():
+    """
+    Return an Outlook.Application COM object, early-bound when possible.
+
+    gencache.EnsureDispatch generates (once) and reuses makepy wrappers so property reads
+    skip the per-call GetIDsOfNames lookup. Falls back to late-bound Dispatch when the
+    gen_py cache cannot be built or written (e.g. read-only frozen build).
+    """
+    try:
+        return win32com.client.gencache.EnsureDispatch("Outlook.Application")
+    except Exception as e:
+        logger.debug("EnsureDispatch failed (%s); falling back to late-bound Dispatch", e)
+        return win32com.client.Dispatch("Outlook.Application")
+
+
+@contextmanager
+def com_apartment():
+    """
+    Initialize COM for the calling worker thread and release it on exit.
+
+    COM proxies are bound to the thread that created them, so a worker thread sends
+    through its own EmailService (see EmailService.for_worker_thread) inside this block.
+    """
+    initialized = False
+    if _win32com_available():
+        try:
+            pythoncom.CoInitialize()
+            initialized = True
+        except Exception as e_ci:
+            logger.debug("pythoncom.CoInitialize() failed or already initialized: %s", e_ci)
+    try:
+        yield
+    finally:
+        if initialized:
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
 
 
 class EmailService:
     """Email service supporting Outlook with multi-account transparency and best-effort selection.
 
-    DEBUG: Verbose logging is enabled to trace Outlook integration and sending flow.
+    Outlook integration and sending flow are traced at DEBUG level on this module's logger.
     """
 
     def __init__(self):
@@ -49,13 +111,13 @@ class EmailService:
         Resets Outlook connection so that any change is reflected on next action.
         """
         try:
-            print(f"[EmailService][DEBUG] set_current_account called: id={account_id}, info={account_info}")
+            logger.debug("set_current_account called: id=%s, info=%s", account_id, account_info)
             self.current_account_email = (account_info or {}).get("email", None)
             self.current_email_address = self.current_account_email
             self._selected_sender_email = self.current_account_email
-            print(f"[EmailService][DEBUG] selected_sender_email set to: {self._selected_sender_email}")
+            logger.debug("selected_sender_email set to: %s", self._selected_sender_email)
         except Exception as e:
-            print(f"[EmailService][DEBUG] Error parsing account_info: {e}")
+            logger.debug("Error parsing account_info: %s", e)
             self.current_account_email = None
             self.current_email_address = None
             self._selected_sender_email = None
@@ -72,9 +134,21 @@ class EmailService:
     def get_current_email_address(self) -> Optional[str]:
         return self.current_email_address
 
+    def for_worker_thread(self) -> "EmailService":
+        """
+        Return a new service with this one's sending preferences but no COM state.
+
+        Use it (inside com_apartment()) to send from a thread other than the one
+        that owns this service's Outlook connection.
+        """
+        clone = EmailService()
+        clone.current_account_email = self.current_account_email
+        clone._preferred_account_id = self._preferred_account_id
+        return clone
+
     # ---------- Core connection ----------
     def _reset_connection(self):
-        print("[EmailService][DEBUG] Resetting Outlook connection state")
+        logger.debug("Resetting Outlook connection state")
         self.outlook = None
         self.outlook_user = None
         self.is_connected = False
@@ -83,79 +157,130 @@ class EmailService:
 
     def connect_to_outlook(self) -> bool:
         """Connect to Outlook application and get current user info."""
-        print("[EmailService][DEBUG] Attempting to connect to Outlook...")
-        if not _WIN32COM_AVAILABLE:
-            print("[EmailService][DEBUG] pywin32 not installed or not importable. Install: pip install pywin32")
+        logger.debug("Attempting to connect to Outlook...")
+        if not _win32com_available():
+            logger.debug("pywin32 not installed or not importable. Install: pip install pywin32")
             self._reset_connection()
             return False
         try:
             try:
                 pythoncom.CoInitialize()
-                print("[EmailService][DEBUG] pythoncom.CoInitialize() succeeded")
+                logger.debug("pythoncom.CoInitialize() succeeded")
             except Exception as e_ci:
-                print(f"[EmailService][DEBUG] pythoncom.CoInitialize() failed or already initialized: {e_ci}")
-            self.outlook = win32com.client.Dispatch("Outlook.Application")
-            print("[EmailService][DEBUG] Outlook.Application dispatch created")
+                logger.debug("pythoncom.CoInitialize() failed or already initialized: %s", e_ci)
+            self.outlook = _dispatch_outlook()
+            logger.debug("Outlook.Application dispatch created")
 
             try:
                 namespace = self.outlook.GetNamespace("MAPI")
-                print("[EmailService][DEBUG] Got MAPI namespace")
+                logger.debug("Got MAPI namespace")
                 current_user = namespace.CurrentUser
-                print(f"[EmailService][DEBUG] CurrentUser acquired: {current_user}")
+                logger.debug("CurrentUser acquired: %s", current_user)
                 self.outlook_user = getattr(current_user, "Name", None)
                 detected_email = None
                 try:
                     detected_email = getattr(current_user, "Address", None)
                 except Exception as e_addr:
-                    print(f"[EmailService][DEBUG] Failed to get current_user.Address: {e_addr}")
+                    logger.debug("Failed to get current_user.Address: %s", e_addr)
                 self.current_email_address = detected_email
-                print(f"[EmailService][DEBUG] outlook_user={self.outlook_user}, detected_email={self.current_email_address}")
+                logger.debug("outlook_user=%s, detected_email=%s", self.outlook_user, self.current_email_address)
             except Exception as e_ns:
-                print(f"[EmailService][DEBUG] Namespace/CurrentUser failed: {e_ns}")
+                logger.debug("Namespace/CurrentUser failed: %s", e_ns)
                 self.outlook_user = "Outlook User"
                 self.current_email_address = None
 
             # Refresh accounts cache after connection
             try:
                 self._accounts_cache = self._enumerate_outlook_accounts_internal()
-                print(f"[EmailService][DEBUG] Enumerated {len(self._accounts_cache)} Outlook account(s)")
+                logger.debug("Enumerated %s Outlook account(s)", len(self._accounts_cache))
             except Exception as e_list:
-                print(f"[EmailService][DEBUG] Failed to enumerate Outlook accounts: {e_list}")
+                logger.debug("Failed to enumerate Outlook accounts: %s", e_list)
                 self._accounts_cache = []
 
             self.is_connected = True
-            print("[EmailService][DEBUG] Outlook connection established")
+            logger.debug("Outlook connection established")
             return True
 
         except Exception as e:
-            print(f"[EmailService][DEBUG] Failed to connect to Outlook: {e}")
+            logger.warning("Failed to connect to Outlook: %s", e)
             self._reset_connection()
             return False
 
+    def probe_outlook(self) -> Dict[str, Any]:
+        """
+        Read the Outlook identity and accounts without keeping any COM object.
+
+        Safe to call from a worker thread: COM is initialized and released locally and
+        only plain data is returned (COM proxies are bound to the thread that created
+        them, so the real connection is still made lazily by the thread that sends).
+        """
+        info: Dict[str, Any] = {"connected": False, "name": None, "email": None, "accounts": []}
+        if not _win32com_available():
+            return info
+        initialized = False
+        try:
+            try:
+                pythoncom.CoInitialize()
+                initialized = True
+            except Exception as e_ci:
+                logger.debug("pythoncom.CoInitialize() failed or already initialized: %s", e_ci)
+            info.update(self._read_outlook_info())
+        except Exception as e:
+            logger.debug("Outlook probe failed: %s", e)
+        finally:
+            if initialized:
+                try:
+                    pythoncom.CoUninitialize()
+                except Exception:
+                    pass
+        return info
+
+    def _read_outlook_info(self) -> Dict[str, Any]:
+        # COM references stay local to this frame so they are released before CoUninitialize
+        outlook = _dispatch_outlook()
+        name, email = None, None
+        try:
+            current_user = outlook.GetNamespace("MAPI").CurrentUser
+            name = getattr(current_user, "Name", None)
+            email = getattr(current_user, "Address", None)
+        except Exception as e_ns:
+            logger.debug("Namespace/CurrentUser failed: %s", e_ns)
+            name = "Outlook User"
+        accounts = self._enumerate_outlook_accounts_internal(outlook)
+        return {"connected": True, "name": name, "email": email, "accounts": accounts}
+
+    def apply_probe_result(self, info: Dict[str, Any]) -> None:
+        """Adopt identity/accounts read by probe_outlook(); the COM connection stays lazy."""
+        if self.is_connected or not info or not info.get("connected"):
+            return
+        self.outlook_user = info.get("name")
+        self.current_email_address = info.get("email")
+        self._accounts_cache = list(info.get("accounts") or [])
+
     def disconnect_from_outlook(self):
-        print("[EmailService][DEBUG] Disconnecting from Outlook")
+        logger.debug("Disconnecting from Outlook")
         self._reset_connection()
 
     def get_current_user(self) -> Optional[str]:
         """Get the current Outlook user's display name."""
         if not self.is_connected:
-            print("[EmailService][DEBUG] get_current_user requires connection; attempting connect")
+            logger.debug("get_current_user requires connection; attempting connect")
             if not self.connect_to_outlook():
                 return None
-        print(f"[EmailService][DEBUG] get_current_user -> {self.outlook_user}")
+        logger.debug("get_current_user -> %s", self.outlook_user)
         return self.outlook_user
 
     def is_outlook_available(self) -> bool:
         """Check if Outlook is available and running."""
         try:
-            if not _WIN32COM_AVAILABLE:
-                print("[EmailService][DEBUG] pywin32 not available -> Outlook not available")
+            if not _win32com_available():
+                logger.debug("pywin32 not available -> Outlook not available")
                 return False
             win32com.client.Dispatch("Outlook.Application")
-            print("[EmailService][DEBUG] Outlook appears available")
+            logger.debug("Outlook appears available")
             return True
         except Exception as e:
-            print(f"[EmailService][DEBUG] Outlook not available: {e}")
+            logger.debug("Outlook not available: %s", e)
             return False
 
     # ---------- Transparency helpers ----------
@@ -190,13 +315,14 @@ class EmailService:
     def get_preferred_outlook_account(self) -> Optional[str]:
         return self._preferred_account_id
 
-    def _enumerate_outlook_accounts_internal(self) -> List[Dict[str, Optional[str]]]:
+    def _enumerate_outlook_accounts_internal(self, outlook=None) -> List[Dict[str, Optional[str]]]:
         """Internal: enumerate Outlook.Session.Accounts best effort."""
         result: List[Dict[str, Optional[str]]] = []
         try:
-            if not self.outlook:
+            outlook = outlook or self.outlook
+            if not outlook:
                 return result
-            session = self.outlook.Session
+            session = outlook.Session
             accounts = getattr(session, "Accounts", None)
             if not accounts:
                 return result
@@ -223,10 +349,10 @@ class EmailService:
                         {"id": str(acc_id), "display_name": str(display_name), "smtp_address": str(smtp) if smtp else None}
                     )
                 except Exception as e_item:
-                    print(f"[EmailService][DEBUG] Failed to read account {i}: {e_item}")
+                    logger.debug("Failed to read account %s: %s", i, e_item)
                     continue
         except Exception as e_all:
-            print(f"[EmailService][DEBUG] Accounts enumeration error: {e_all}")
+            logger.debug("Accounts enumeration error: %s", e_all)
         return result
 
     def _resolve_account_by_id(self, account_id: str):
@@ -271,45 +397,41 @@ class EmailService:
         bcc_emails: Optional[List[str]] = None,
     ) -> bool:
         """Send an email using Outlook. Best-effort apply preferred Outlook account if set."""
-        print(f"[EmailService][DEBUG] send_email called")
-        print(f"[EmailService][DEBUG]   to={to_emails}")
-        print(f"[EmailService][DEBUG]   cc={cc_emails}")
-        print(f"[EmailService][DEBUG]   bcc={bcc_emails}")
-        print(f"[EmailService][DEBUG]   subject={subject}")
-        print(f"[EmailService][DEBUG]   attachment={attachment_path}")
-        print(f"[EmailService][DEBUG]   preferred_outlook_account_id={self._preferred_account_id}")
+        logger.debug(
+            "send_email called: to=%s cc=%s bcc=%s subject=%s attachment=%s preferred_outlook_account_id=%s",
+            to_emails, cc_emails, bcc_emails, subject, attachment_path, self._preferred_account_id,
+        )
 
         self._last_send_context = {}
 
         if not self.is_connected:
-            print("[EmailService][DEBUG] Not connected; attempting to connect...")
+            logger.debug("Not connected; attempting to connect...")
             if not self.connect_to_outlook():
-                print("[EmailService][DEBUG] Connection failed; aborting send")
+                logger.debug("Connection failed; aborting send")
                 return False
-        if not _WIN32COM_AVAILABLE:
-            print("[EmailService][DEBUG] Cannot send: pywin32 not available")
+        if not _win32com_available():
+            logger.debug("Cannot send: pywin32 not available")
             return False
 
         try:
             if not self.outlook:
-                print("[EmailService][DEBUG] Outlook object is None")
+                logger.debug("Outlook object is None")
                 return False
             mail = self.outlook.CreateItem(0)  # 0 = olMailItem
-            print("[EmailService][DEBUG] Mail item created")
+            logger.debug("Mail item created")
             mail.To = "; ".join(to_emails or [])
             if cc_emails:
                 mail.CC = "; ".join(cc_emails)
             if bcc_emails:
                 mail.BCC = "; ".join(bcc_emails)
-            mail.Subject = subject or ""
-            mail.Body = body or ""
+            self._set_subject_and_body(mail, subject or "", body or "")
 
             if attachment_path:
                 if os.path.exists(attachment_path):
                     mail.Attachments.Add(attachment_path)
-                    print(f"[EmailService][DEBUG] Attachment added: {attachment_path}")
+                    logger.debug("Attachment added: %s", attachment_path)
                 else:
-                    print(f"[EmailService][DEBUG] Attachment path does not exist: {attachment_path}")
+                    logger.debug("Attachment path does not exist: %s", attachment_path)
 
             # Best-effort: set SendUsingAccount if preferred account is set and resolvable
             attempted_account_id = None
@@ -322,13 +444,13 @@ class EmailService:
                         try:
                             mail.SendUsingAccount = acc_obj
                             applied_account = True
-                            print("[EmailService][DEBUG] SendUsingAccount applied")
+                            logger.debug("SendUsingAccount applied")
                         except Exception as e_set:
-                            print(f"[EmailService][DEBUG] Failed to set SendUsingAccount: {e_set}")
+                            logger.debug("Failed to set SendUsingAccount: %s", e_set)
                     else:
-                        print("[EmailService][DEBUG] Preferred account id could not be resolved; using Outlook default")
+                        logger.debug("Preferred account id could not be resolved; using Outlook default")
                 except Exception as e_res:
-                    print(f"[EmailService][DEBUG] Error resolving preferred account: {e_res}")
+                    logger.debug("Error resolving preferred account: %s", e_res)
 
             # Snapshot effective context for transparency
             self._last_send_context = {
@@ -338,13 +460,32 @@ class EmailService:
             }
 
             mail.Send()
-            print("[EmailService][DEBUG] Mail.Send() invoked successfully")
+            logger.debug("Mail.Send() invoked successfully")
             return True
 
         except Exception as e:
-            print(f"[EmailService][DEBUG] Failed to send email via Outlook: {e}")
+            logger.warning("Failed to send email via Outlook: %s", e)
             return False
 
+    @staticmethod
+    def _set_subject_and_body(mail, subject: str, body: str) -> None:
+        """
+        Set Subject and Body in a single PropertyAccessor round trip.
+
+        Recipients are not part of the batch: PR_DISPLAY_TO/CC/BCC are computed from the
+        recipient table, so To/CC/BCC must keep going through the MailItem properties.
+        Falls back to individual setters if SetProperties is unavailable or reports errors.
+        """
+        try:
+            errors = mail.PropertyAccessor.SetProperties([_PR_SUBJECT_W, _PR_BODY_W], [subject, body])
+            if not any(errors or ()):
+                return
+            logger.debug("SetProperties reported errors: %s; using individual setters", errors)
+        except Exception as e:
+            logger.debug("SetProperties failed: %s; using individual setters", e)
+        mail.Subject = subject
+        mail.Body = body
+
     # ---------- Stopover helper and templates ----------
     def send_stopover_email(
         self,
@@ -355,7 +496,7 @@ class EmailService:
     ) -> bool:
         """Send email for a specific stopover with PDF attachment."""
         if not os.path.exists(pdf_path):
-            print(f"PDF file not found: {pdf_path}")
+            logger.warning("PDF file not found: %s", pdf_path)
             return False
 
         subject, body_template = self._load_templates_json()
@@ -371,7 +512,7 @@ class EmailService:
             if template_file.exists():
                 return template_file.read_text(encoding="utf-8")
         except Exception as e:
-            print(f"Failed to load template: {e}")
+            logger.warning("Failed to load template: %s", e)
         return None
 
     def _get_default_template(self) -> str:
@@ -389,8 +530,8 @@ class EmailService:
         try:
             manager = get_config_manager()
             subject, body = manager.get_effective_templates()
-            print("[EmailService][DEBUG] Templates loaded")
+            logger.debug("Templates loaded")
             return subject, body
         except Exception as e:
-            print(f"[EmailService][DEBUG] Failed to load templates from ConfigManager: {e}")
+            logger.warning("Failed to load templates from ConfigManager: %s", e)
             return "Stopover Report - {{stopover_code}}", self._get_default_template()
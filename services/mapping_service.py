@@ -1,9 +1,32 @@
 """Service for managing stopover-to-email mappings via ConfigManager (unified source of truth)."""
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 from .config_manager import get_config_manager
 
 
+@lru_cache(maxsize=1024, typed=True)
+def _upper_cached(c) -> str:
+    return str(c).upper()
+
+
+def _norm_code(c) -> str:
+    """Uppercase a stopover code, skipping the allocation when it is already normalized."""
+    if type(c) is str and c.isupper():
+        return c
+    try:
+        # UI handlers pass the same raw codes repeatedly; reuse the uppercased string
+        return _upper_cached(c)
+    except TypeError:
+        # Unhashable input
+        return str(c).upper()
+
+
+def _norm_email(e) -> str:
+    """Strip an email, skipping the allocation when there is no surrounding whitespace."""
+    return e if (type(e) is str and not e[:1].isspace() and not e[-1:].isspace()) else str(e).strip()
+
+
 class MappingService:
     """
     Facade over ConfigManager for mappings.
@@ -13,59 +36,105 @@ class MappingService:
     def __init__(self, config_dir: str = "config"):
         # config_dir retained for compatibility but unused
         self._manager = get_config_manager()
+        # Per-code membership sets mirroring the persisted lists (O(1) dedup in add/remove).
+        # Any mapping change in ConfigManager invalidates them; mutators re-store their own.
+        self._email_sets: Dict[str, Set[str]] = {}
+        # Read-only snapshot of the mappings for the accessors, replaced by the fresh copy each
+        # change notification carries. Own mutators also drop it, since notifications are
+        # held back inside ConfigManager.batch().
+        self._maps: Optional[Dict[str, List[str]]] = None
+        self._manager.on_mappings_changed(self._on_mappings_changed)
 
-    def get_emails_for_stopover(self, stopover_code: str) -> List[str]:
-        code = str(stopover_code).upper()
-        return list(self._manager.get_mappings().get(code, []))
+    def _on_mappings_changed(self, maps: Dict[str, List[str]]) -> None:
+        self._email_sets.clear()
+        self._maps = maps
+
+    def _mappings(self) -> Dict[str, List[str]]:
+        maps = self._maps
+        if maps is None:
+            maps = self._maps = self._manager.get_mappings()
+        return maps
+
+    def _email_set(self, code: str, current: List[str]) -> Set[str]:
+        s = self._email_sets.get(code)
+        if s is None:
+            s = self._email_sets[code] = set(current)
+        return s
+
+    def get_emails_for_stopover(self, stopover_code: str) -> Tuple[str, ...]:
+        # Read-only view: callers only iterate/len-check; mutators copy at the mutation site
+        code = _norm_code(stopover_code)
+        return tuple(self._mappings().get(code, ()))
 
     def add_mapping(self, stopover_code: str, email: str) -> bool:
-        code = str(stopover_code).upper()
-        email = str(email).strip()
-        maps = self._manager.get_mappings()
-        current = list(maps.get(code, []))
-        if email and email not in current:
+        code = _norm_code(stopover_code)
+        email = _norm_email(email)
+        current = list(self._mappings().get(code, []))
+        seen = self._email_set(code, current)
+        if email and email not in seen:
+            seen.add(email)
             current.append(email)
+            self._maps = None
             self._manager.set_mapping(code, current)
             self._manager.add_stopover(code)  # ensure enabled
+            # set_mapping notified observers (clearing the cache); this set is still current
+            self._email_sets[code] = seen
             return True
         return False
 
     def remove_mapping(self, stopover_code: str, email: str) -> bool:
-        code = str(stopover_code).upper()
-        email = str(email).strip()
-        maps = self._manager.get_mappings()
-        if code in maps and email in (maps.get(code) or []):
-            new_list = [e for e in maps.get(code, []) if e != email]
+        code = _norm_code(stopover_code)
+        email = _norm_email(email)
+        current = self._mappings().get(code) or []
+        seen = self._email_set(code, current)
+        if email in seen:
+            seen.discard(email)
+            new_list = [e for e in current if e != email]
+            self._maps = None
             if new_list:
                 self._manager.set_mapping(code, new_list)
+                self._email_sets[code] = seen
             else:
                 # remove entire mapping if empty
                 self._manager.remove_mapping(code)
             return True
         return False
 
+    def get_mappings_for_codes(self, stopover_codes) -> Dict[str, Tuple[str, ...]]:
+        """Return {code: emails} for the given codes in one pass; unmapped codes are omitted."""
+        maps = self._mappings()
+        result: Dict[str, Tuple[str, ...]] = {}
+        for raw in stopover_codes or ():
+            emails = maps.get(_norm_code(raw))
+            if emails:
+                result[raw] = tuple(emails)
+        return result
+
     def get_all_mappings(self) -> Dict[str, List[str]]:
         return self._manager.get_mappings()
 
     def get_mapped_stopovers(self) -> List[str]:
-        return sorted(list(self._manager.get_mappings().keys()))
+        return sorted(self._mappings())
 
     def has_mapping(self, stopover_code: str) -> bool:
-        code = str(stopover_code).upper()
-        maps = self._manager.get_mappings()
-        return code in maps and len(maps.get(code) or []) > 0
+        return bool(self._mappings().get(_norm_code(stopover_code)))
 
     def update_mappings(self, new_mappings: Dict[str, List[str]]):
-        # Normalize and persist each mapping via ConfigManager setters
-        for code, emails in (new_mappings or {}).items():
-            c = str(code).upper()
-            dedup = []
-            for e in emails or []:
-                s = str(e).strip()
-                if s and s not in dedup:
-                    dedup.append(s)
-            if dedup:
-                self._manager.set_mapping(c, dedup)
-                self._manager.add_stopover(c)
-            else:
-                self._manager.remove_mapping(c)
+        # Normalize and persist each mapping via ConfigManager setters (single disk write)
+        with self._manager.batch():
+            self._email_sets.clear()
+            self._maps = None
+            for code, emails in (new_mappings or {}).items():
+                c = _norm_code(code)
+                seen = set()
+                dedup = []
+                for e in emails or []:
+                    s = _norm_email(e)
+                    if s and s not in seen:
+                        seen.add(s)
+                        dedup.append(s)
+                if dedup:
+                    self._manager.set_mapping(c, dedup)
+                    self._manager.add_stopover(c)
+                else:
+                    self._manager.remove_mapping(c)
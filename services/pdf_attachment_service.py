@@ -0,0 +1,165 @@
+"""Service for building per-stopover PDF attachments (one page extracted from the source PDF)."""
+
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.stopover import Stopover
+
+DEFAULT_FILENAME_PATTERN = "Enquête - SATISFACTION - CLIENT -  {{stopover_code}}.pdf"
+
+# Below this many stopovers, process pool startup costs more than it saves
+PARALLEL_MIN_STOPOVERS = 4
+
+_INVALID_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|]+')
+
+
+def render_attachment_filename(pattern: Optional[str], stopover_code: str) -> str:
+    """Render the attachment filename for a stopover from a filename pattern."""
+    code_val = stopover_code or ""
+    pattern = (pattern or "").strip() or DEFAULT_FILENAME_PATTERN
+    # Support both legacy {{stopovercode}} and new {{stopover_code}} tokens
+    rendered = pattern.replace("{{stopover_code}}", code_val).replace("{{stopovercode}}", code_val)
+    # Ensure .pdf suffix
+    if not rendered.lower().endswith(".pdf"):
+        rendered = f"{rendered}.pdf"
+    # Sanitize Windows-invalid chars
+    rendered = _INVALID_FILENAME_CHARS.sub("-", rendered).strip().strip(".")
+    # Fallback if empty after sanitize
+    if not rendered:
+        rendered = DEFAULT_FILENAME_PATTERN.replace("{{stopover_code}}", code_val)
+    return rendered
+
+
+def _unique_path(output_dir: str, filename: str, reserved: Optional[set] = None) -> str:
+    """Return a path in output_dir that neither exists on disk nor is already reserved."""
+    base_name, ext = os.path.splitext(filename)
+    candidate = os.path.join(output_dir, filename)
+    idx = 1
+    while os.path.exists(candidate) or (reserved is not None and candidate in reserved):
+        candidate = os.path.join(output_dir, f"{base_name}-{idx}{ext}")
+        idx += 1
+    if reserved is not None:
+        reserved.add(candidate)
+    return candidate
+
+
+def _page_number(stopover: Stopover) -> int:
+    page_num = getattr(stopover, "page_number", 1)
+    if not isinstance(page_num, int) or page_num <= 0:
+        page_num = 1
+    return page_num
+
+
+def _extract_page(pdf_path: str, page_number: int, output_path: str) -> Optional[str]:
+    """
+    Write page `page_number` (1-based) of pdf_path to output_path.
+
+    Module-level so it can be pickled into worker processes. Returns the written
+    path, or None if the page is out of range or the extraction failed.
+    """
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(pdf_path) as src:
+            if page_number < 1 or page_number > len(src):
+                return None
+            with fitz.open() as dst:
+                dst.insert_pdf(src, from_page=page_number - 1, to_page=page_number - 1)
+                dst.save(output_path)
+        return output_path if os.path.exists(output_path) else None
+    except Exception:
+        return None
+
+
+class PDFAttachmentService:
+    """Creates single-page PDF attachments for stopovers."""
+
+    @staticmethod
+    def create_stopover_attachment(
+        pdf_path: str,
+        stopover: Stopover,
+        output_dir: Optional[str] = None,
+        filename_pattern: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Build a one-page PDF containing only the stopover's page.
+
+        Returns the attachment path, or None if it could not be created
+        (callers typically fall back to sending the whole PDF).
+        """
+        if not pdf_path:
+            return None
+        out_dir = output_dir or tempfile.gettempdir()
+        filename = render_attachment_filename(filename_pattern, getattr(stopover, "code", "") or "")
+        candidate = _unique_path(out_dir, filename)
+        return _extract_page(pdf_path, _page_number(stopover), candidate)
+
+    @staticmethod
+    def iter_attachments_parallel(
+        pdf_path: str,
+        stopovers: Iterable[Stopover],
+        output_dir: Optional[str] = None,
+        filename_pattern: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Build attachments for many stopovers, yielding (index, path_or_None) as each one is done.
+
+        index is the stopover's position in `stopovers`, so callers can start using an
+        attachment while later ones are still being extracted. PyMuPDF parsing is CPU-bound,
+        so larger batches run in worker processes that each open their own copy of the source
+        document; batches smaller than PARALLEL_MIN_STOPOVERS run sequentially, in order.
+        """
+        stopovers = list(stopovers or [])
+        if not pdf_path or not stopovers:
+            return
+        out_dir = output_dir or tempfile.gettempdir()
+
+        # Reserve unique output paths up-front so concurrent workers never collide
+        reserved: set = set()
+        jobs: List[Tuple[int, str]] = []
+        for s in stopovers:
+            filename = render_attachment_filename(filename_pattern, getattr(s, "code", "") or "")
+            jobs.append((_page_number(s), _unique_path(out_dir, filename, reserved)))
+
+        if len(jobs) < PARALLEL_MIN_STOPOVERS:
+            for idx, (page_number, path) in enumerate(jobs):
+                yield idx, _extract_page(pdf_path, page_number, path)
+            return
+
+        workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_extract_page, pdf_path, page_number, path): idx
+                for idx, (page_number, path) in enumerate(jobs)
+            }
+            for fut in as_completed(futures):
+                try:
+                    created = fut.result()
+                except Exception:
+                    created = None
+                yield futures[fut], created
+
+    @staticmethod
+    def create_attachments_parallel(
+        pdf_path: str,
+        stopovers: Iterable[Stopover],
+        output_dir: Optional[str] = None,
+        filename_pattern: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Build attachments for many stopovers (see iter_attachments_parallel).
+
+        Returns {stopover_code: attachment_path} for the attachments that were created.
+        """
+        stopovers = list(stopovers or [])
+        results: Dict[str, str] = {}
+        for idx, created in PDFAttachmentService.iter_attachments_parallel(
+            pdf_path, stopovers, output_dir, filename_pattern, max_workers
+        ):
+            if created:
+                results[getattr(stopovers[idx], "code", "") or ""] = created
+        return results
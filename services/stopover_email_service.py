@@ -1,17 +1,36 @@
 """Service for managing stopover-specific email configurations backed by ConfigManager."""
 
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional
+import heapq
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
 
 from .config_manager import get_config_manager
+from .mapping_service import _norm_code, _norm_email
 
+# Fallbacks when no template is persisted
+_DEFAULT_SUBJECT = "Stopover Report - {{stopover_code}}"
+_DEFAULT_BODY = ""
 
-@dataclass
+# ConfigManager handle shared by every StopoverEmailService instance. Resolved on
+# first construction rather than at import, since building the manager loads config.
+_MANAGER = None
+
+
+def _mgr():
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = get_config_manager()
+    return _MANAGER
+
+
+@dataclass(slots=True)
 class StopoverEmailConfig:
     """Configuration for stopover-specific email settings."""
 
     stopover_code: str
-    subject_template: str = "Stopover Report - {{stopover_code}}"
+    subject_template: str = _DEFAULT_SUBJECT
     body_template: str = """Dear Team,
 
 Please find attached the stopover report for {{stopover_code}}.
@@ -20,9 +39,10 @@ This report contains all relevant information for this stopover location.
 
 Best regards,
 PDF Stopover Analyzer"""
-    recipients: List[str] = None
-    cc_recipients: List[str] = None
-    bcc_recipients: List[str] = None
+    # Any sequence of str is accepted; built configs carry fresh lists, callers copy before mutating
+    recipients: Sequence[str] = None
+    cc_recipients: Sequence[str] = None
+    bcc_recipients: Sequence[str] = None
     is_enabled: bool = True
     last_sent_at: Optional[str] = None  # ISO 8601 UTC timestamp e.g. "2025-07-31T10:22:45Z"
 
@@ -35,6 +55,30 @@ PDF Stopover Analyzer"""
         if self.bcc_recipients is None:
             self.bcc_recipients = []
 
+    @classmethod
+    def _unchecked(
+        cls,
+        stopover_code: str,
+        subject_template: str,
+        body_template: str,
+        recipients: Sequence[str],
+        cc_recipients: Sequence[str],
+        bcc_recipients: Sequence[str],
+        is_enabled: bool,
+        last_sent_at: Optional[str],
+    ) -> "StopoverEmailConfig":
+        """Fast constructor for internal builders that always pass concrete lists (skips __post_init__)."""
+        obj = object.__new__(cls)
+        obj.stopover_code = stopover_code
+        obj.subject_template = subject_template
+        obj.body_template = body_template
+        obj.recipients = recipients
+        obj.cc_recipients = cc_recipients
+        obj.bcc_recipients = bcc_recipients
+        obj.is_enabled = is_enabled
+        obj.last_sent_at = last_sent_at
+        return obj
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "StopoverEmailConfig":
         """Create StopoverEmailConfig from dictionary (backward compatible)."""
@@ -49,7 +93,17 @@ PDF Stopover Analyzer"""
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert StopoverEmailConfig to dictionary."""
-        return asdict(self)
+        # Flat schema (str/bool/list[str]): shallow list copies are enough, no asdict deep walk
+        return {
+            "stopover_code": self.stopover_code,
+            "subject_template": self.subject_template,
+            "body_template": self.body_template,
+            "recipients": list(self.recipients),
+            "cc_recipients": list(self.cc_recipients),
+            "bcc_recipients": list(self.bcc_recipients),
+            "is_enabled": self.is_enabled,
+            "last_sent_at": self.last_sent_at,
+        }
 
 
 class StopoverEmailService:
@@ -74,21 +128,21 @@ class StopoverEmailService:
 
     def __init__(self, config_dir: str = "config"):
         # config_dir retained for compatibility; not used for persistence anymore.
-        self._manager = get_config_manager()
+        self._manager = _mgr()
 
     @staticmethod
     def _encode_recipients(to_list, cc_list, bcc_list) -> list:
         encoded = []
         for e in to_list or []:
-            s = str(e).strip()
+            s = _norm_email(e)
             if s:
                 encoded.append(s)
         for e in cc_list or []:
-            s = str(e).strip()
+            s = _norm_email(e)
             if s:
                 encoded.append(f"{StopoverEmailService._CC_TAG}{s}")
         for e in bcc_list or []:
-            s = str(e).strip()
+            s = _norm_email(e)
             if s:
                 encoded.append(f"{StopoverEmailService._BCC_TAG}{s}")
         return encoded
@@ -96,16 +150,20 @@ class StopoverEmailService:
     @staticmethod
     def _decode_recipients(encoded_list) -> tuple[list, list, list]:
         to_list, cc_list, bcc_list = [], [], []
-        for raw in encoded_list or []:
-            s = str(raw).strip()
+        # Hot per-stopover loop: bind tags/lengths/helpers to locals once
+        cc_tag, bcc_tag = StopoverEmailService._CC_TAG, StopoverEmailService._BCC_TAG
+        cc_len, bcc_len = len(cc_tag), len(bcc_tag)
+        norm = _norm_email
+        for raw in encoded_list or ():
+            s = norm(raw)
             if not s:
                 continue
-            if s.startswith(StopoverEmailService._CC_TAG):
-                cc = s[len(StopoverEmailService._CC_TAG):].strip()
+            if s.startswith(cc_tag):
+                cc = s[cc_len:].strip()
                 if cc:
                     cc_list.append(cc)
-            elif s.startswith(StopoverEmailService._BCC_TAG):
-                bcc = s[len(StopoverEmailService._BCC_TAG):].strip()
+            elif s.startswith(bcc_tag):
+                bcc = s[bcc_len:].strip()
                 if bcc:
                     bcc_list.append(bcc)
             else:
@@ -117,43 +175,53 @@ class StopoverEmailService:
 
         Note: Return effective templates so the UI reflects the same subject/body that
         EmailService will actually use when sending (persisted value or default fallback)."""
-        code = str(stopover_code).upper()
-        # Raw templates snapshot (kept for future use if needed)
-        _ = self._manager.get_templates()
-        maps = self._manager.get_mappings()
-        last = self._manager.get_last_sent()
-        is_enabled = self._manager.is_stopover_enabled(code)
-
-        encoded = list(maps.get(code, []))
-        to_list, cc_list, bcc_list = self._decode_recipients(encoded)
+        return self._get_config_fast(_norm_code(stopover_code))
+
+    def _get_config_fast(self, code: str) -> StopoverEmailConfig:
+        """get_config for a code that is already normalized (upper-case)."""
+        if __debug__:
+            assert code == code.upper(), f"stopover code not normalized: {code!r}"
+        with self._snapshot() as snap:
+            return self._build_config(code, snap)
+
+    @contextmanager
+    def _snapshot(self):
+        """One consistent view of ConfigManager state for a block of reads (each getter copies)."""
+        stopovers = self._manager.get_stopovers()
+        yield SimpleNamespace(
+            templates=self._manager.get_effective_templates(),
+            mappings=self._manager.get_mappings(),
+            last_sent=self._manager.get_last_sent(),
+            stopovers=stopovers,
+            stopovers_set=set(stopovers),
+        )
 
+    def _build_config(self, code: str, snap: SimpleNamespace) -> StopoverEmailConfig:
+        """Build a config for an already-normalized code from a _snapshot() view."""
+        to_list, cc_list, bcc_list = self._decode_recipients(snap.mappings.get(code, []))
         # Use effective templates (persisted-or-default) to match sending path
-        subject_eff, body_eff = self._manager.get_effective_templates()
-
-        return StopoverEmailConfig(
+        subject_eff, body_eff = snap.templates
+        return StopoverEmailConfig._unchecked(
             stopover_code=code,
             subject_template=subject_eff,
             body_template=body_eff,
             recipients=to_list,
             cc_recipients=cc_list,
             bcc_recipients=bcc_list,
-            is_enabled=is_enabled,
-            last_sent_at=last.get(code),
+            is_enabled=code in snap.stopovers_set,
+            last_sent_at=snap.last_sent.get(code),
         )
 
     def save_config(self, config: StopoverEmailConfig) -> bool:
         """Persist recipients/enablement/last_sent via ConfigManager (with CC/BCC encode)."""
-        code = str(config.stopover_code).upper()
+        code = _norm_code(config.stopover_code)
         if config.is_enabled:
             self._manager.add_stopover(code)
         else:
             self._manager.remove_stopover(code)
 
-        encoded = self._encode_recipients(
-            list(config.recipients or []),
-            list(config.cc_recipients or []),
-            list(config.bcc_recipients or []),
-        )
+        # _encode_recipients only iterates: no defensive copies needed
+        encoded = self._encode_recipients(config.recipients, config.cc_recipients, config.bcc_recipients)
         # Store back as a flat list; ConfigManager schema remains unchanged
         self._manager.set_mapping(code, encoded)
 
@@ -161,60 +229,60 @@ class StopoverEmailService:
             self._manager.set_last_sent(code, config.last_sent_at)
         return True
 
-    def get_all_configs(self) -> Dict[str, StopoverEmailConfig]:
-        """Return all known stopovers from union of stopovers and mappings keys."""
-        stopovers = set(self._manager.get_stopovers())
-        stopovers.update(self._manager.get_mappings().keys())
-        result: Dict[str, StopoverEmailConfig] = {}
-        for code in sorted(stopovers):
-            result[code] = self.get_config(code)
-        return result
-
-    def get_all_configs(self) -> Dict[str, StopoverEmailConfig]:
-        """Return all known stopovers from union of stopovers and mappings keys."""
-        stopovers = set(self._manager.get_stopovers())
-        stopovers.update(self._manager.get_mappings().keys())
-        result: Dict[str, StopoverEmailConfig] = {}
-        for code in sorted(stopovers):
-            result[code] = self.get_config(code)
-        return result
+    def get_all_configs(self, limit: Optional[int] = None) -> Dict[str, StopoverEmailConfig]:
+        """Return all known stopovers from union of stopovers and mappings keys.
+
+        Codes are returned in sorted order. With `limit`, only the first `limit` codes are
+        built (heapq.nsmallest: O(N log k) instead of sorting the whole union).
+        """
+        # Fetch each ConfigManager snapshot once instead of once per stopover
+        with self._snapshot() as snap:
+            codes = snap.stopovers_set | snap.mappings.keys()
+            ordered = sorted(codes) if limit is None else heapq.nsmallest(max(0, limit), codes)
+            build = self._build_config
+            return {code: build(code, snap) for code in ordered}
 
     def delete_config(self, stopover_code: str) -> bool:
-        code = str(stopover_code).upper()
+        code = _norm_code(stopover_code)
         changed = False
-        maps = self._manager.get_mappings()
-        if code in maps:
-            self._manager.remove_mapping(code)
-            changed = True
-        stops = self._manager.get_stopovers()
-        if code in stops:
-            self._manager.remove_stopover(code)
-            changed = True
-        last = self._manager.get_last_sent()
-        if code in last:
-            self._manager.clear_last_sent_normalized(code)
-            changed = True
+        with self._snapshot() as snap, self._manager.batch():
+            if code in snap.mappings:
+                self._manager.remove_mapping(code)
+                changed = True
+            if code in snap.stopovers_set:
+                self._manager.remove_stopover(code)
+                changed = True
+            if code in snap.last_sent:
+                self._manager.clear_last_sent_normalized(code)
+                changed = True
         return changed
 
     def config_exists(self, stopover_code: str) -> bool:
-        code = str(stopover_code).upper()
-        return code in self._manager.get_stopovers() or code in self._manager.get_mappings()
+        code = _norm_code(stopover_code)
+        return self._manager.stopover_contains(code) or self._manager.mapping_contains(code)
 
     def get_enabled_configs(self) -> Dict[str, StopoverEmailConfig]:
-        enabled: Dict[str, StopoverEmailConfig] = {}
-        for code in self._manager.get_stopovers():
-            enabled[code] = self.get_config(code)
-        return enabled
+        with self._snapshot() as snap:
+            build = self._build_config
+            return {code: build(code, snap) for code in snap.stopovers}
 
     def set_last_sent_now(self, stopover_code: str) -> None:
-        code = str(stopover_code).upper()
+        code = _norm_code(stopover_code)
         self._manager.set_last_sent(code)
 
+    def set_last_sent_now_batch(self, stopover_codes: List[str]) -> None:
+        """Mark several stopovers as sent now with a single config write and notification."""
+        self._manager.set_last_sent_many([_norm_code(c) for c in stopover_codes or []])
+
     def get_last_sent(self, stopover_code: str) -> Optional[str]:
-        code = str(stopover_code).upper()
+        code = _norm_code(stopover_code)
         return self._manager.get_last_sent().get(code)
 
+    def get_all_last_sent(self) -> Dict[str, str]:
+        """Snapshot of every stopover's last-sent timestamp, for bulk readers (one copy, not one per code)."""
+        return self._manager.get_last_sent()
+
     def _load_templates_json(self) -> "tuple[str, str]":
         """Load subject/body from unified ConfigManager templates."""
         t = self._manager.get_templates()
-        return t.get("subject", "Stopover Report - {{stopover_code}}"), t.get("body", "")
+        return t.get("subject", _DEFAULT_SUBJECT), t.get("body", _DEFAULT_BODY)
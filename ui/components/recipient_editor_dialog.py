@@ -1,9 +1,23 @@
+import re
 from typing import List, Tuple
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QLabel, QPushButton
 )
 
+# "," and ";" both separate addresses
+_SEP_RE = re.compile(r"[,;]+")
+
+
+def split_emails(text: str) -> List[str]:
+    """Split a recipients field into addresses: one pass that strips, drops empties and repeats (order kept)."""
+    seen = {}
+    for part in _SEP_RE.split(text or ""):
+        e = part.strip()
+        if e:
+            seen.setdefault(e, None)
+    return list(seen)
+
 
 class RecipientEditorDialog(QDialog):
     """
@@ -65,8 +79,7 @@ class RecipientEditorDialog(QDialog):
 
     @staticmethod
     def _split_emails(text: str) -> List[str]:
-        raw = text or ""
-        return [e.strip() for e in raw.split(",") if e.strip()]
+        return split_emails(text)
 
     def get_values(self) -> Tuple[List[str], List[str], List[str]]:
         to_vals = self._split_emails(self.to_edit.text())
@@ -1,6 +1,6 @@
-from PySide6.QtCore import Signal, Qt
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QSizePolicy, QStyle
-from typing import Optional
+from PySide6.QtCore import QStringListModel, QTimer, Signal, Qt
+from PySide6.QtWidgets import QCompleter, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QSizePolicy, QStyle
+from typing import Iterable, Optional
 
 
 class HeaderToolbar(QWidget):
@@ -22,6 +22,12 @@ class HeaderToolbar(QWidget):
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        # Standard icons looked up once; setOutlookConnected swaps between the first two
+        s = self.style()
+        self._icoYes = s.standardIcon(QStyle.SP_DialogYesButton)
+        self._icoReload = s.standardIcon(QStyle.SP_BrowserReload)
+        self._icoFwd = s.standardIcon(QStyle.SP_ArrowForward)
+        self._icoCfg = s.standardIcon(QStyle.SP_FileDialogDetailedView)
         self._build_ui()
 
     def _build_ui(self):
@@ -42,53 +48,63 @@ class HeaderToolbar(QWidget):
 
         # Outlook connect/disconnect
         self.connectBtn = QPushButton("Connecter Outlook")
-        try:
-            # Initial state = not connected -> "Connecter Outlook"
-            self.connectBtn.setIcon(self.style().standardIcon(QStyle.SP_DialogYesButton))
-        except Exception:
-            pass
+        # Initial state = not connected -> "Connecter Outlook"
+        self.connectBtn.setIcon(self._icoYes)
         self.connectBtn.clicked.connect(self.outlookConnectClicked.emit)
         root.addWidget(self.connectBtn, 0)
 
         # Search/filter
         self.searchEdit = QLineEdit()
         self.searchEdit.setPlaceholderText("Rechercher des escales…")
-        self.searchEdit.textChanged.connect(self._emit_filter_changed)
+        # Stopover codes offered as completions (see setCompletionCodes); matched natively by Qt
+        self._completerModel = QStringListModel(self)
+        self._completer = QCompleter(self._completerModel, self)
+        self._completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.searchEdit.setCompleter(self._completer)
+        # Picking a completion sets the text programmatically (no textEdited): filter right away
+        self._completer.activated.connect(self._do_emit_filter_changed)
+        # Typing emits filterChanged once the text has been still for 300 ms, not per keystroke
+        self._filterTimer = QTimer(self)
+        self._filterTimer.setSingleShot(True)
+        self._filterTimer.setInterval(300)
+        self._filterTimer.timeout.connect(self._do_emit_filter_changed)
+        # textEdited: user input only, programmatic setText does not re-emit anything
+        self.searchEdit.textEdited.connect(self._emit_filter_changed)
 
         self.statusCombo = QComboBox()
         self.statusCombo.addItems(["Tous", "En attente", "Envoi", "Réussi", "Échec", "En file"])
-        self.statusCombo.currentTextChanged.connect(self._emit_filter_changed)
+        # A status pick is a discrete choice: apply it at once
+        self.statusCombo.currentTextChanged.connect(self._do_emit_filter_changed)
 
         root.addWidget(self.searchEdit, 1)
         root.addWidget(self.statusCombo, 0)
 
-        # Template mini editor (subject only inline; body via dialog typically, but keep a quick body line)
+        # Template mini editor (subject only inline; body via dialog typically, but keep a quick body line).
+        # Same 300 ms pause before templateChanged, shared by both edits
+        self._tplTimer = QTimer(self)
+        self._tplTimer.setSingleShot(True)
+        self._tplTimer.setInterval(300)
+        self._tplTimer.timeout.connect(self._do_emit_template_changed)
         self.subjectEdit = QLineEdit()
         self.subjectEdit.setPlaceholderText("Modèle d’objet global")
-        self.subjectEdit.textChanged.connect(self._emit_template_changed)
+        self.subjectEdit.textEdited.connect(self._emit_template_changed)
 
         self.bodyEdit = QLineEdit()
         self.bodyEdit.setPlaceholderText("Modèle de corps global (rapide)")
-        self.bodyEdit.textChanged.connect(self._emit_template_changed)
+        self.bodyEdit.textEdited.connect(self._emit_template_changed)
 
         root.addWidget(self.subjectEdit, 2)
         root.addWidget(self.bodyEdit, 3)
 
         # Actions
         self.sendAllBtn = QPushButton("Envoyer à toutes les escales")
-        try:
-            self.sendAllBtn.setIcon(self.style().standardIcon(QStyle.SP_ArrowForward))
-        except Exception:
-            pass
+        self.sendAllBtn.setIcon(self._icoFwd)
         self.sendAllBtn.clicked.connect(self.sendAllClicked.emit)
         self.sendAllBtn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         root.addWidget(self.sendAllBtn, 0)
 
         self.settingsBtn = QPushButton("Paramètres")
-        try:
-            self.settingsBtn.setIcon(self.style().standardIcon(QStyle.SP_FileDialogDetailedView))
-        except Exception:
-            pass
+        self.settingsBtn.setIcon(self._icoCfg)
         self.settingsBtn.clicked.connect(self.settingsClicked.emit)
         root.addWidget(self.settingsBtn, 0)
 
@@ -105,31 +121,42 @@ class HeaderToolbar(QWidget):
     def setOutlookConnected(self, connected: bool, email: Optional[str]):
         """Update connect button and label state (without showing email)."""
         self.connectBtn.setText("Reconnecter Outlook" if connected else "Connecter Outlook")
-        try:
-            # Update icon according to current semantics
-            if connected:
-                # Reconnect/refresh semantics
-                self.connectBtn.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
-            else:
-                self.connectBtn.setIcon(self.style().standardIcon(QStyle.SP_DialogYesButton))
-        except Exception:
-            pass
+        # Update icon according to current semantics (reconnect/refresh once connected)
+        self.connectBtn.setIcon(self._icoReload if connected else self._icoYes)
         # Do not display the email address; show generic status only.
         self.accountLabel.setText("Outlook : connecté" if connected else "Outlook : non connecté")
 
+    def setCompletionCodes(self, codes: Iterable[str]):
+        """Set the stopover codes suggested while typing in the search field."""
+        codes = sorted({c for c in codes if c})
+        if codes != self._completerModel.stringList():
+            self._completerModel.setStringList(codes)
+
     def setGlobalTemplate(self, subject: str, body: str):
-        # Avoid signal storms when programmatically setting
-        try:
-            self.subjectEdit.blockSignals(True)
-            self.bodyEdit.blockSignals(True)
-            self.subjectEdit.setText(subject or "")
-            self.bodyEdit.setText(body or "")
-        finally:
-            self.subjectEdit.blockSignals(False)
-            self.bodyEdit.blockSignals(False)
+        subject = subject or ""
+        body = body or ""
+        # The edits report textEdited only, so setText emits no templateChanged.
+        # Unchanged texts are not set (setText would still reset cursor/undo state)
+        if subject == self.subjectEdit.text() and body == self.bodyEdit.text():
+            return
+        # A debounced emit from earlier typing would now report the programmatic texts
+        # as a user edit: the new template supersedes it
+        self._tplTimer.stop()
+        if subject != self.subjectEdit.text():
+            self.subjectEdit.setText(subject)
+        if body != self.bodyEdit.text():
+            self.bodyEdit.setText(body)
 
     def _emit_template_changed(self):
+        self._tplTimer.start()
+
+    def _do_emit_template_changed(self):
         self.templateChanged.emit(self.subjectEdit.text(), self.bodyEdit.text())
 
     def _emit_filter_changed(self):
+        self._filterTimer.start()
+
+    def _do_emit_filter_changed(self):
+        # Also covers any search edit still waiting on the timer
+        self._filterTimer.stop()
         self.filterChanged.emit(self.searchEdit.text(), self.statusCombo.currentText())
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Optional
-from PySide6.QtCore import Qt, QSize, QPoint, Signal, QObject, QThread, QRect
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from PySide6.QtCore import Qt, QSize, QPoint, Signal, Slot, QObject, QThread, QRect, QCoreApplication
 from PySide6.QtGui import QPixmap, QImage, QAction, QWheelEvent, QMouseEvent, QPalette, QDesktopServices
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QFileDialog, QFrame, QToolBar, QStyle, QSizePolicy, QMessageBox, QScrollArea
 
@@ -37,31 +39,211 @@ def pil_to_qimage(img: Image.Image) -> QImage:
         return qimg
 
 
-class _RenderWorker(QObject):
-    rendered = Signal(QPixmap)
-    error = Signal(str)
+# Rendered pages shared by all PdfPreview widgets, so rebuilding the email preview list
+# (filter change, template edit) does not decode the same pages again.
+# Keyed by (pdf_path, mtime, page_number, max_w, max_h); values are QImages, which
+# unlike QPixmaps may be created and read from any thread.
+_PAGE_CACHE_SIZE = 32
+_page_cache: "OrderedDict[Tuple[str, float, int, int, int], QImage]" = OrderedDict()
+_page_cache_lock = threading.Lock()
 
-    def __init__(self, pdf_path: str, page_number: int, max_w: int, max_h: int):
+
+def _page_cache_key(pdf_path: str, page_number: int, max_w: int, max_h: int) -> Optional[tuple]:
+    try:
+        return (pdf_path, os.path.getmtime(pdf_path), page_number, max_w, max_h)
+    except OSError:
+        return None
+
+
+def _page_cache_get(key: Optional[tuple]) -> Optional[QImage]:
+    if key is None:
+        return None
+    with _page_cache_lock:
+        qimg = _page_cache.get(key)
+        if qimg is not None:
+            _page_cache.move_to_end(key)
+        return qimg
+
+
+def _page_cache_put(key: Optional[tuple], qimg: QImage) -> None:
+    if key is None:
+        return
+    with _page_cache_lock:
+        _page_cache[key] = qimg
+        _page_cache.move_to_end(key)
+        while len(_page_cache) > _PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+# Size previews render pages at (the page is then fitted to the widget)
+_PREVIEW_MAX_W, _PREVIEW_MAX_H = 1200, 800
+
+
+def drop_cached_pages(keep_path: Optional[str] = None) -> None:
+    """Evict cached pages of every PDF other than keep_path."""
+    with _page_cache_lock:
+        for key in [k for k in _page_cache if k[0] != keep_path]:
+            del _page_cache[key]
+
+
+class _PageRenderWorker(QObject):
+    """Renders pages on a PageRenderThread, keeping the current document open between requests."""
+    rendered = Signal(int, object)
+    failed = Signal(int, str)
+    done = Signal(int)
+
+    def __init__(self, is_stale: Callable[[object, int], bool]):
         super().__init__()
-        self.pdf_path = pdf_path
-        self.page_number = page_number
-        self.max_w = max_w
-        self.max_h = max_h
-        # render hint: request higher DPI for better quality (used by renderer if applicable)
-        self.target_dpi = 192
-
-    def run(self):
+        self._is_stale = is_stale
+        self._renderer = None
+
+    @Slot(int, object, str, int, int, int, bool)
+    def render(self, request_id: int, key: object, pdf_path: str, page_number: int, max_w: int, max_h: int, as_qimage: bool):
         try:
-            from core.pdf_renderer import PDFRenderer
-            renderer = PDFRenderer(self.pdf_path)
-            # Render at higher internal resolution for sharper preview, then we will downscale with SmoothTransformation
-            img = renderer.get_page_image(self.page_number, max_width=self.max_w, max_height=self.max_h)
-            renderer.close()
-            qimg = pil_to_qimage(img)
-            # Convert to QPixmap with no further scaling here (keep native high-res)
-            self.rendered.emit(QPixmap.fromImage(qimg))
-        except Exception as e:
-            self.error.emit(str(e))
+            # A newer request for the same key was queued meanwhile: its owner no longer wants this one
+            if self._is_stale(key, request_id):
+                return
+            try:
+                if self._renderer is None or self._renderer.pdf_path != pdf_path:
+                    self.close_renderer()
+                    from core.pdf_renderer import PDFRenderer
+                    self._renderer = PDFRenderer(pdf_path)
+                img = self._renderer.get_page_image(page_number, max_width=max_w, max_height=max_h)
+                if as_qimage:
+                    # Deep copy so the QImage owns its pixels once the PIL buffer goes away
+                    img = pil_to_qimage(img).copy()
+                elif img.mode != "RGB":
+                    # Normalize once, off the GUI thread, so every later fit resamples plain RGB
+                    img = img.convert("RGB")
+                else:
+                    img.load()
+                self.rendered.emit(request_id, img)
+            except Exception as e:
+                self.failed.emit(request_id, str(e))
+        finally:
+            self.done.emit(request_id)
+
+    @Slot()
+    def close_renderer(self):
+        if self._renderer is not None:
+            try:
+                self._renderer.close()
+            except Exception:
+                pass
+            self._renderer = None
+
+
+class PageRenderThread(QObject):
+    """
+    Persistent background thread rendering PDF pages to PIL images (or QImages).
+
+    request() returns an id; the result comes back on the owner's thread through
+    rendered(id, image) or failed(id, message). Requests sharing a key supersede
+    each other: only the latest one per key is rendered.
+    """
+    rendered = Signal(int, object)
+    failed = Signal(int, str)
+    _submit = Signal(int, object, str, int, int, int, bool)
+    _release = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._next_id = 0
+        self._latest: Dict[object, int] = {}
+        self._key_of: Dict[int, object] = {}
+        self._thread = QThread(self)
+        self._worker = _PageRenderWorker(self._is_stale)
+        self._worker.moveToThread(self._thread)
+        self._submit.connect(self._worker.render)
+        self._release.connect(self._worker.close_renderer)
+        self._worker.rendered.connect(self.rendered)
+        self._worker.failed.connect(self.failed)
+        self._worker.done.connect(self._on_done)
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _is_stale(self, key: object, request_id: int) -> bool:
+        return key is not None and self._latest.get(key) != request_id
+
+    def _on_done(self, request_id: int):
+        # Forget finished (or skipped) requests so short-lived keys do not accumulate
+        key = self._key_of.pop(request_id, None)
+        if key is not None and self._latest.get(key) == request_id:
+            del self._latest[key]
+
+    def request(self, pdf_path: str, page_number: int, max_w: int, max_h: int,
+                key: object = None, as_qimage: bool = False) -> int:
+        self._next_id += 1
+        request_id = self._next_id
+        if key is not None:
+            self._latest[key] = request_id
+            self._key_of[request_id] = key
+        self._submit.emit(request_id, key, pdf_path, page_number, max_w, max_h, as_qimage)
+        return request_id
+
+    def release_document(self):
+        """Close the document held by the worker (e.g. when the PDF changes)."""
+        self._release.emit()
+
+    def shutdown(self):
+        if self._thread.isRunning():
+            self._thread.quit()
+            if not self._thread.wait(2000):
+                # Still rendering; leave the document to the worker rather than close it under it
+                return
+        self._worker.close_renderer()
+
+
+_shared_render_thread: Optional[PageRenderThread] = None
+
+
+def shared_render_thread() -> PageRenderThread:
+    """Render thread shared by all PdfPreview widgets (created on first use)."""
+    global _shared_render_thread
+    if _shared_render_thread is None:
+        _shared_render_thread = PageRenderThread(QCoreApplication.instance())
+        _shared_render_thread.rendered.connect(_on_prefetch_done)
+        _shared_render_thread.failed.connect(_on_prefetch_failed)
+    return _shared_render_thread
+
+
+# Prefetch requests in flight: cache key -> request id, and back
+_prefetch_inflight: Dict[tuple, int] = {}
+_prefetch_keys: Dict[int, tuple] = {}
+
+
+def _on_prefetch_done(request_id: int, result=None):
+    key = _prefetch_keys.pop(request_id, None)
+    if key is None:
+        return
+    _prefetch_inflight.pop(key, None)
+    if isinstance(result, QImage):
+        _page_cache_put(key, result)
+
+
+def _on_prefetch_failed(request_id: int, _msg: str):
+    _on_prefetch_done(request_id)
+
+
+def prefetch_pages(pdf_path: str, page_numbers) -> None:
+    """
+    Render pages into the shared page cache ahead of time, on the shared render thread.
+
+    PdfPreview widgets created later find them cached, or wait for the in-flight
+    prefetch instead of rendering the page a second time.
+    """
+    if not pdf_path:
+        return
+    render_thread = shared_render_thread()
+    for page_number in page_numbers:
+        key = _page_cache_key(pdf_path, page_number, _PREVIEW_MAX_W, _PREVIEW_MAX_H)
+        if key is None or key in _prefetch_inflight or _page_cache_get(key) is not None:
+            continue
+        request_id = render_thread.request(pdf_path, page_number, _PREVIEW_MAX_W, _PREVIEW_MAX_H, as_qimage=True)
+        _prefetch_inflight[key] = request_id
+        _prefetch_keys[request_id] = key
 
 
 class PdfPreview(QWidget):
@@ -80,10 +262,14 @@ class PdfPreview(QWidget):
         self._scale: float = 1.0
         self._base_pixmap: Optional[QPixmap] = None
         self._fit_to_view: bool = True  # always show full page initially (fit-to-container)
+        self._render_pending: bool = False  # document set with defer=True, not rendered yet
+        # (source pixmap key, target size) of the pixmap currently on imageLabel
+        self._shown_key: Optional[tuple] = None
 
-        # Thread members
-        self.thread: Optional[QThread] = None
-        self.worker: Optional[_RenderWorker] = None
+        # Id of the in-flight request on the shared render thread
+        self._request_id: Optional[int] = None
+        self._render_connected: bool = False
+        self._cache_key: Optional[tuple] = None
 
         self._build_ui()
 
@@ -148,40 +334,91 @@ class PdfPreview(QWidget):
         self.placeholder.setVisible(False)
         root.addWidget(self.placeholder)
 
-    def setDocument(self, pdf_path: str, page_number: int):
-        """Set document path and target page."""
+    def setDocument(self, pdf_path: str, page_number: int, defer: bool = False):
+        """
+        Set document path and target page.
+
+        With defer=True the page is not rendered until ensureRendered() is called,
+        so long lists can render only the previews the user scrolls to.
+        """
         self._pdf_path = pdf_path
         self._page_number = max(1, page_number)
         self._scale = 1.0
         self._base_pixmap = None
         self._fit_to_view = True  # every new doc starts fitted (full page visible)
+        if defer:
+            self._render_pending = True
+            self.imageLabel.setText("Aperçu en attente…")
+            return
+        self._render_pending = False
         self._render_async()
 
+    def isRenderPending(self) -> bool:
+        return self._render_pending
+
+    def ensureRendered(self):
+        """Start the deferred render, if any."""
+        if self._render_pending:
+            self._render_pending = False
+            self._render_async()
+
+    def releaseRender(self):
+        """Drop the rendered page to free memory; it is rendered again by ensureRendered()."""
+        if self._base_pixmap is None:
+            return
+        self._base_pixmap = None
+        self._shown_key = None
+        self.imageLabel.clear()
+        self.imageLabel.setText("Aperçu en attente…")
+        self._render_pending = True
+
     def _render_async(self):
         if not self._pdf_path or not os.path.exists(self._pdf_path):
             self._show_placeholder(f"Fichier introuvable : {self._pdf_path or ''}")
             return
 
-        # Ensure any previous thread is properly shut down
-        self._cleanup_thread()
-
-        # Start worker thread
-        self.thread = QThread(self)
-        # Restore previous stable render size to avoid regressions
-        self.worker = _RenderWorker(self._pdf_path, self._page_number, 1200, 800)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.rendered.connect(self._on_rendered)
-        self.worker.error.connect(self._on_render_error)
-        # Clean up and ownership
-        self.worker.rendered.connect(self.thread.quit)
-        self.worker.error.connect(self.thread.quit)
-        self.thread.finished.connect(self._on_thread_finished)
-        self.thread.start()
-
-    def _on_rendered(self, pix: QPixmap):
+        max_w, max_h = _PREVIEW_MAX_W, _PREVIEW_MAX_H
+
+        # Page already rendered by this or another preview: no thread needed
+        self._cache_key = _page_cache_key(self._pdf_path, self._page_number, max_w, max_h)
+        cached = _page_cache_get(self._cache_key)
+        if cached is not None:
+            self._request_id = None
+            self._on_rendered(cached)
+            return
+
+        # All previews share one render thread, which keeps the PDF open across pages
+        render_thread = shared_render_thread()
+        if not self._render_connected:
+            render_thread.rendered.connect(self._on_page_rendered)
+            render_thread.failed.connect(self._on_page_failed)
+            self._render_connected = True
+        # Page already being prefetched: adopt that request instead of rendering it twice
+        prefetch_id = _prefetch_inflight.get(self._cache_key) if self._cache_key is not None else None
+        if prefetch_id is not None:
+            self._request_id = prefetch_id
+            return
+        self._request_id = render_thread.request(
+            self._pdf_path, self._page_number, max_w, max_h, key=id(self), as_qimage=True
+        )
+
+    def _on_page_rendered(self, request_id: int, qimg):
+        if request_id != self._request_id:
+            return
+        self._request_id = None
+        _page_cache_put(self._cache_key, qimg)
+        self._on_rendered(qimg)
+
+    def _on_page_failed(self, request_id: int, msg: str):
+        if request_id != self._request_id:
+            return
+        self._request_id = None
+        self._on_render_error(msg)
+
+    def _on_rendered(self, qimg: QImage):
         self.placeholder.setVisible(False)
-        self._base_pixmap = pix
+        # Convert to QPixmap with no further scaling here (keep native high-res)
+        self._base_pixmap = QPixmap.fromImage(qimg)
         # On first render or reset, show entire page fitted to scroll area
         self._fit_to_view = True
         self._apply_scaled_pixmap()
@@ -207,26 +444,32 @@ class PdfPreview(QWidget):
         if self._fit_to_view:
             # Fit the entire page into the visible scroll area viewport
             viewport = self.scrollArea.viewport().size()
-            if viewport.width() <= 0 or viewport.height() <= 0:
-                scaled = self._base_pixmap
-            else:
-                scaled = self._base_pixmap.scaled(
-                    viewport, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-                )
+            target = None if viewport.width() <= 0 or viewport.height() <= 0 else viewport
         else:
             size = self._base_pixmap.size()
-            new_size = QSize(int(size.width() * self._scale), int(size.height() * self._scale))
+            target = QSize(int(size.width() * self._scale), int(size.height() * self._scale))
+
+        # Same source at the same target size: the label already shows this pixmap
+        key = (self._base_pixmap.cacheKey(), None if target is None else (target.width(), target.height()))
+        if key == self._shown_key:
+            return
+
+        if target is None:
+            scaled = self._base_pixmap
+        else:
             scaled = self._base_pixmap.scaled(
-                new_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+                target, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
             )
 
         self.imageLabel.setPixmap(scaled)
         self.imageLabel.resize(scaled.size())
+        self._shown_key = key
 
     def _show_placeholder(self, text: str):
         self.placeholder.setText(text)
         self.placeholder.setVisible(True)
         self.imageLabel.clear()
+        self._shown_key = None
         self._fit_to_view = True
 
     def _open_externally(self):
@@ -266,30 +509,6 @@ class PdfPreview(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Ouvrir en externe", f"Erreur lors de l’ouverture externe : {e}")
 
-    def _on_thread_finished(self):
-        # Called when thread finishes; delete worker and thread safely
-        if self.worker:
-            self.worker.deleteLater()
-            self.worker = None
-        if self.thread:
-            self.thread.deleteLater()
-            self.thread = None
-
-    def _cleanup_thread(self):
-        # Ensure no running thread remains (prevents 'QThread: Destroyed while thread is still running')
-        if self.thread:
-            try:
-                self.thread.quit()
-                self.thread.wait(1500)
-            except Exception:
-                pass
-            self._on_thread_finished()
-
-    def closeEvent(self, event):
-        # Ensure threads are cleaned up on widget close
-        self._cleanup_thread()
-        super().closeEvent(event)
-
     def _reset_fit_to_view(self):
         # Reset to full-page preview (no zoom cropping)
         self._fit_to_view = True
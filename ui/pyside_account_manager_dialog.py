@@ -1,20 +1,11 @@
 from __future__ import annotations
-from typing import Optional, List
-from PySide6.QtCore import Qt, QSize
+from typing import Optional
+from PySide6.QtCore import QSignalBlocker
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QGroupBox, QMessageBox, QWidget, QFormLayout, QDialogButtonBox, QComboBox, QStyle, QPushButton
+    QDialog, QVBoxLayout, QLabel, QGroupBox, QWidget, QFormLayout, QDialogButtonBox, QComboBox
 )
 from services.email_service import EmailService
 
-try:
-    import win32com.client  # type: ignore
-    import pythoncom  # type: ignore
-    _WIN32_AVAILABLE = True
-except Exception:
-    win32com = None  # type: ignore
-    pythoncom = None  # type: ignore
-    _WIN32_AVAILABLE = False
-
 
 class AccountManagerDialog(QDialog):
     """
@@ -71,28 +62,27 @@ class AccountManagerDialog(QDialog):
         except Exception:
             accounts = []
         # Refill combo while preserving the first default entry
-        self._ol_combo.blockSignals(True)
-        while self._ol_combo.count() > 1:
-            self._ol_combo.removeItem(1)
-        for acc in accounts:
-            label = acc.get("display_name") or "Compte Outlook"
-            smtp = acc.get("smtp_address")
-            if smtp:
-                label = f"{label} — {smtp}"
-            self._ol_combo.addItem(label, userData=acc.get("id"))
-        # Preselect preferred if any
-        try:
-            pref = self._email_service.get_preferred_outlook_account()
-            if pref is None:
-                self._ol_combo.setCurrentIndex(0)
-            else:
-                for i in range(1, self._ol_combo.count()):
-                    if str(self._ol_combo.itemData(i)) == str(pref):
-                        self._ol_combo.setCurrentIndex(i)
-                        break
-        except Exception:
-            pass
-        self._ol_combo.blockSignals(False)
+        with QSignalBlocker(self._ol_combo):
+            self._ol_combo.clear()
+            self._ol_combo.addItem("Par défaut (laisser Outlook choisir)", userData=None)
+            for acc in accounts:
+                label = acc.get("display_name") or "Compte Outlook"
+                smtp = acc.get("smtp_address")
+                if smtp:
+                    label = f"{label} — {smtp}"
+                self._ol_combo.addItem(label, userData=acc.get("id"))
+            # Preselect preferred if any
+            try:
+                pref = self._email_service.get_preferred_outlook_account()
+                if pref is None:
+                    self._ol_combo.setCurrentIndex(0)
+                else:
+                    # Keyed lookup on item data (account ids are strings)
+                    idx = self._ol_combo.findData(str(pref))
+                    if idx >= 1:
+                        self._ol_combo.setCurrentIndex(idx)
+            except Exception:
+                pass
 
         # Refresh detected label
         eff = self._email_service.get_effective_sender() if hasattr(self._email_service, "get_effective_sender") else {}
@@ -1,23 +1,165 @@
 """PySide6 Email Preview tab preserving behavior from Tkinter EmailPreviewTabComponent."""
 
-from typing import List, Optional, Dict, Tuple
-from PySide6.QtCore import Qt, QTimer, QSize
+import queue
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Dict, Set, Tuple
+from PySide6.QtCore import Qt, QTimer, QSize, Slot, Signal, QObject, QSignalBlocker
 from PySide6.QtGui import QFont, QTextOption
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QTextEdit, QPushButton, QMessageBox,
-    QScrollArea, QSizePolicy, QFrame, QLineEdit, QComboBox, QStyle
+    QScrollArea, QSizePolicy, QFrame, QLineEdit, QComboBox, QStyle, QProgressBar
 )
 from models.stopover import Stopover
 from services.mapping_service import MappingService
-from services.email_service import EmailService
+from services.email_service import EmailService, com_apartment
 from services.stopover_email_service import StopoverEmailService
 from services.config_manager import get_config_manager
-from ui.pdf_preview import PdfPreview
+from services.pdf_attachment_service import DEFAULT_FILENAME_PATTERN, PDFAttachmentService
+from ui.pdf_preview import PdfPreview, drop_cached_pages, prefetch_pages
 
 # Simple persistence for per-stopover overrides (subject/body).
 # Stored in config manager under a dedicated key; cleared on template change.
 OVERRIDES_KEY = "email_overrides"
 
+# Subject used when no global template is set
+_DEFAULT_SUBJECT_TEMPLATE = "Rapport d’escale – {{stopover_code}}"
+
+# Number of leading stopover pages rendered in the background when a PDF is set
+_PREFETCH_PAGES = 4
+
+# Preview items created per event-loop pass; the rest are added in later passes
+_ITEM_BUILD_BATCH = 8
+
+# Concurrent Outlook send lanes for "send all"
+_SEND_WORKERS = 4
+
+# Persistent threads for "send all", reused across runs instead of new threads per click:
+# one runs each _SendAllWorker, the other holds its attachment producer and send lanes
+_SEND_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-send")
+_SEND_LANE_POOL = ThreadPoolExecutor(max_workers=_SEND_WORKERS + 1, thread_name_prefix="email-send-lane")
+
+# One StopoverEmailService shared by the tab and its items (created on first use)
+_SES: Optional[StopoverEmailService] = None
+
+
+def _shared_stopover_email_service() -> StopoverEmailService:
+    global _SES
+    if _SES is None:
+        _SES = StopoverEmailService()
+    return _SES
+
+
+@lru_cache(maxsize=64)
+def _split_template(template: str) -> Tuple[str, ...]:
+    return tuple(template.split("{{stopover_code}}"))
+
+
+def _render_template(template: str, code: str) -> str:
+    """Substitute {{stopover_code}}; the template is split once and reused for every stopover."""
+    return code.join(_split_template(template))
+
+
+class _SendJob(NamedTuple):
+    stopover: Stopover
+    code: str
+    to: List[str]
+    cc: List[str]
+    bcc: List[str]
+    subject: str
+    body: str
+
+
+class _SendAllWorker(QObject):
+    """
+    Sends the prepared emails off the GUI thread (each Outlook send blocks for a while).
+
+    A producer thread extracts the attachments and queues each job as soon as its page is
+    ready; a few send lanes run by a small thread pool consume the queue, so extraction of
+    later pages overlaps the Outlook sends of earlier ones. Outlook COM is apartment-bound,
+    so each lane initializes its own apartment and sends through its own EmailService;
+    results are reported through queued signals.
+    """
+    item_sent = Signal(str)
+    # One per job handled, sent or not (drives the determinate progress bar)
+    item_done = Signal()
+    finished = Signal()
+
+    def __init__(self, email_service: EmailService, jobs: List[_SendJob], pdf_path: Optional[str], filename_pattern: str):
+        super().__init__()
+        self._email_service = email_service
+        self._jobs = jobs
+        self._pdf_path = pdf_path
+        self._filename_pattern = filename_pattern
+
+    def _produce(self, ready: "queue.Queue[Optional[Tuple[_SendJob, Optional[str]]]]", lanes: int):
+        """Queue (job, attachment) pairs as attachments complete, then one stop marker per lane."""
+        pending = set(range(len(self._jobs)))
+        try:
+            if self._pdf_path:
+                for idx, created in PDFAttachmentService.iter_attachments_parallel(
+                    self._pdf_path, [job.stopover for job in self._jobs], filename_pattern=self._filename_pattern
+                ):
+                    pending.discard(idx)
+                    # In case of any failure, fallback to sending the whole file
+                    ready.put((self._jobs[idx], created or self._pdf_path))
+        except Exception as e:
+            print(f"[EmailPreviewTabWidget] attachment preparation failed: {e}")
+        finally:
+            # Jobs whose page was not extracted still go out, with the whole file
+            for idx in sorted(pending):
+                ready.put((self._jobs[idx], self._pdf_path))
+            for _ in range(lanes):
+                ready.put(None)
+
+    def _send_lane(self, ready: "queue.Queue[Optional[Tuple[_SendJob, Optional[str]]]]"):
+        """Send queued jobs on the calling pool thread, through a thread-owned service."""
+        email_service = self._email_service.for_worker_thread()
+        with com_apartment():
+            try:
+                while True:
+                    entry = ready.get()
+                    if entry is None:
+                        break
+                    job, attachment = entry
+                    try:
+                        ok = email_service.send_email(
+                            to_emails=job.to,
+                            subject=job.subject,
+                            body=job.body,
+                            attachment_path=attachment,
+                            cc_emails=job.cc,
+                            bcc_emails=job.bcc,
+                        )
+                        if ok:
+                            self.item_sent.emit(job.code)
+                    except Exception as e:
+                        print(f"[EmailPreviewTabWidget] send all failed for {job.stopover.code}: {e}")
+                    self.item_done.emit()
+            finally:
+                # Drop COM references before the apartment is released
+                email_service.disconnect_from_outlook()
+
+    def run(self):
+        try:
+            if not self._jobs:
+                return
+            lanes = min(_SEND_WORKERS, len(self._jobs))
+            # Unbounded: the producer never waits on the lanes, and entries are only small tuples
+            ready: "queue.Queue[Optional[Tuple[_SendJob, Optional[str]]]]" = queue.Queue()
+            producer = _SEND_LANE_POOL.submit(self._produce, ready, lanes)
+            futures = [_SEND_LANE_POOL.submit(self._send_lane, ready) for _ in range(lanes)]
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"[EmailPreviewTabWidget] send lane failed: {e}")
+            producer.result()
+        finally:
+            self.finished.emit()
+
 
 class StopoverEmailPreviewItem(QWidget):
     """
@@ -51,75 +193,46 @@ class StopoverEmailPreviewItem(QWidget):
         left.addWidget(title)
 
         # Build clickable "À:" line to open the StopoverEmailSettingsDialog
-        # We wrap the whole recipients block into an anchor to keep implementation simple.
-        # If there is no recipient, still allow click to open the dialog.
-        to_line_plain = ", ".join(recipients) if recipients else "Aucune adresse email"
-        # Use a custom scheme to avoid external opening; we'll handle linkActivated.
-        to_href = f"stopover://{(stopover.code or '').upper()}"
         header = QLabel()
         header.setTextFormat(Qt.RichText)
         header.setTextInteractionFlags(Qt.TextBrowserInteraction)
         header.setOpenExternalLinks(False)
-        header.setText(f"Objet&nbsp;: {subject}<br/>À&nbsp;: <a href=\"{to_href}\" style=\"text-decoration: underline; color: #0F056B;\">{to_line_plain}</a>")
+        header.setText(self._header_html())
+        self.header_label = header
         header.setToolTip("Cliquer pour configurer les destinataires de cette escale")
-        # Visual affordance through cursor via stylesheet
-        header.setStyleSheet("a { text-decoration: underline; }")
-        # Connect link activation to open the settings dialog
-        from PySide6.QtCore import Slot
-        @Slot(str)
-        def _on_header_link(_href: str):
-            try:
-                # Lazy import to avoid top-level coupling
-                from ui.pyside_stopover_email_dialog import StopoverEmailSettingsDialog
-                # Find a suitable parent tab to access its StopoverEmailService and refresh API
-                parent_widget = self.parent()
-                tab_widget = None
-                w = parent_widget
-                # Walk up to find EmailPreviewTabWidget
-                while w is not None:
-                    if isinstance(w, EmailPreviewTabWidget):
-                        tab_widget = w
-                        break
-                    w = w.parent()
-                if tab_widget is None:
-                    # Fallback: open with local service instance if tab not found (shouldn't happen)
-                    local_service = StopoverEmailService()
-                    dlg = StopoverEmailSettingsDialog(self, self.stopover.code, local_service)
-                    if dlg.exec():
-                        # No direct refresh handle; try to trigger a safe rebuild if tab exists later
-                        pass
-                    return
-                # Use the tab's shared StopoverEmailService instance to keep config unified
-                dlg = StopoverEmailSettingsDialog(tab_widget, self.stopover.code, tab_widget._stopover_email_service)
-                if dlg.exec():
-                    # After saving, refresh configs and coalesced-rebuild preview so recipients update immediately
-                    try:
-                        tab_widget.refresh_recipients_from_configs()
-                    except Exception:
-                        pass
-                    # Always schedule a coalesced rebuild to ensure UI reflects changes
-                    try:
-                        tab_widget._rebuild_items_async()
-                    except Exception:
-                        pass
-            except Exception as e:
-                # Non-blocking error reporting to console
-                print(f"[StopoverEmailPreviewItem] Failed to open email settings: {e}")
-        header.linkActivated.connect(_on_header_link)
+        # Underline comes from the anchor's inline style; no per-widget stylesheet
+        # (each setStyleSheet gives the widget its own style sheet to parse and polish)
+        # Connect link activation to open the settings dialog (one bound method, no per-item closure)
+        header.linkActivated.connect(self._on_header_link)
         left.addWidget(header)
 
-        self.body_view = QTextEdit()
-        # Rendre le corps éditable et persister automatiquement
-        self.body_view.setReadOnly(False)
-        self.body_view.setPlainText(body)
-        self.body_view.setWordWrapMode(QTextOption.WordWrap)
-        # Persistance automatique à chaque modification (debounce léger via QTimer du parent)
-        self.body_view.textChanged.connect(lambda: QTimer.singleShot(200, self._auto_persist_body))
-        left.addWidget(self.body_view, 1)
+        # Body shown as a plain label; the QTextEdit (a full document + editor per item)
+        # is only created when the user asks to edit this stopover's body
+        self.body_view: Optional[QTextEdit] = None
+        self.body_label = QLabel()
+        self.body_label.setTextFormat(Qt.PlainText)
+        self.body_label.setText(body)
+        self.body_label.setWordWrap(True)
+        self.body_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.body_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.body_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        left.addWidget(self.body_label, 1)
+        self._left_layout = left
+        # Body as last persisted (or as built); unchanged text is not written again
+        self._persisted_body = body
+        # Persistance automatique débouncée : une seule écriture après la dernière frappe
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(300)
+        self._persist_timer.timeout.connect(self._auto_persist_body)
 
         # Actions row
         actions_row = QHBoxLayout()
         actions_row.addStretch(1)
+        self.edit_body_btn = QPushButton("Modifier")
+        self.edit_body_btn.setToolTip("Modifier le corps de l’email pour cette escale")
+        self.edit_body_btn.clicked.connect(self._open_body_editor)
+        actions_row.addWidget(self.edit_body_btn)
         self.send_one_btn = QPushButton("Envoyer")
         try:
             self.send_one_btn.setIcon(self.style().standardIcon(QStyle.SP_ArrowForward))
@@ -130,11 +243,11 @@ class StopoverEmailPreviewItem(QWidget):
         actions_row.addWidget(self.send_one_btn)
 
 
-        # Info if no recipients
-        if not recipients:
-            warn = QLabel("Aucun destinataire configuré pour cette escale")
-            warn.setStyleSheet("color: #b58900;")
-            actions_row.addWidget(warn)
+        # Info if no recipients (kept around so set_recipients can toggle it)
+        self._no_recipient_warning = QLabel("Aucun destinataire configuré pour cette escale")
+        self._no_recipient_warning.setObjectName("NoRecipientWarning")  # styled in style_pyside.qss
+        self._no_recipient_warning.setVisible(not recipients)
+        actions_row.addWidget(self._no_recipient_warning)
 
         left.addLayout(actions_row)
 
@@ -161,8 +274,8 @@ class StopoverEmailPreviewItem(QWidget):
                 page_num = getattr(stopover, "page_number", 1)
                 if not isinstance(page_num, int) or page_num <= 0:
                     page_num = 1
-                # Set the document and target page
-                self.pdf_preview.setDocument(self.pdf_path, page_num)
+                # Set the document and target page; the tab renders it once scrolled into view
+                self.pdf_preview.setDocument(self.pdf_path, page_num, defer=True)
                 right.addWidget(self.pdf_preview, 1)
         except Exception:
             self.pdf_preview = None
@@ -170,7 +283,7 @@ class StopoverEmailPreviewItem(QWidget):
         if not self.pdf_preview:
             self.preview_frame = QFrame()
             self.preview_frame.setFrameShape(QFrame.Box)
-            self.preview_frame.setStyleSheet("QFrame { background: white; }")
+            self.preview_frame.setObjectName("PreviewPlaceholder")  # styled in style_pyside.qss
             # Make placeholder expand to use available space nicely
             self.preview_frame.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             right.addWidget(self.preview_frame, 2)
@@ -182,6 +295,94 @@ class StopoverEmailPreviewItem(QWidget):
         if not self.pdf_preview:
             self._update_preview_size()
 
+    def _header_html(self) -> str:
+        # We wrap the whole recipients block into an anchor to keep implementation simple.
+        # If there is no recipient, still allow click to open the dialog.
+        to_line_plain = ", ".join(self.recipients) if self.recipients else "Aucune adresse email"
+        # Use a custom scheme to avoid external opening; we'll handle linkActivated.
+        to_href = f"stopover://{(self.stopover.code or '').upper()}"
+        return f"Objet&nbsp;: {self.subject}<br/>À&nbsp;: <a href=\"{to_href}\" style=\"text-decoration: underline; color: #0F056B;\">{to_line_plain}</a>"
+
+    def set_recipients(self, recipients: List[str]):
+        """Update the "À:" line in place; the body editor (and any edit in progress) is left alone."""
+        if list(recipients) == list(self.recipients):
+            return
+        self.recipients = recipients
+        self.header_label.setText(self._header_html())
+        self._no_recipient_warning.setVisible(not recipients)
+
+    def set_texts(self, subject: str, body: str):
+        """Update subject and body in place; a body edit in progress is left alone."""
+        if subject != self.subject:
+            self.subject = subject
+            self.header_label.setText(self._header_html())
+        if body == self.body:
+            return
+        self.body = body
+        if self.body_view is None:
+            self.body_label.setText(body)
+            self._persisted_body = body
+        elif self.body_view.toPlainText() == self._persisted_body and not self._persist_timer.isActive():
+            # Not a user edit: do not let textChanged persist it back as an override
+            with QSignalBlocker(self.body_view):
+                self.body_view.setPlainText(body)
+            self._persisted_body = body
+
+    @Slot(str)
+    def _on_header_link(self, _href: str):
+        try:
+            # Lazy import to avoid top-level coupling
+            from ui.pyside_stopover_email_dialog import StopoverEmailSettingsDialog
+            # Find a suitable parent tab to access its StopoverEmailService and refresh API
+            parent_widget = self.parent()
+            tab_widget = None
+            w = parent_widget
+            # Walk up to find EmailPreviewTabWidget
+            while w is not None:
+                if isinstance(w, EmailPreviewTabWidget):
+                    tab_widget = w
+                    break
+                w = w.parent()
+            if tab_widget is None:
+                # Fallback: open with local service instance if tab not found (shouldn't happen)
+                dlg = StopoverEmailSettingsDialog(self, self.stopover.code, _shared_stopover_email_service())
+                if dlg.exec():
+                    # No direct refresh handle; try to trigger a safe rebuild if tab exists later
+                    pass
+                return
+            # Use the tab's shared StopoverEmailService instance to keep config unified
+            dlg = StopoverEmailSettingsDialog(tab_widget, self.stopover.code, tab_widget._stopover_email_service)
+            if dlg.exec():
+                # After saving, refresh configs and update the items' recipients in place
+                try:
+                    tab_widget.refresh_recipients_from_configs()
+                    tab_widget.update_item_recipients()
+                except Exception:
+                    # Fall back to a coalesced rebuild to ensure UI reflects changes
+                    tab_widget._rebuild_items_async()
+        except Exception as e:
+            # Non-blocking error reporting to console
+            print(f"[StopoverEmailPreviewItem] Failed to open email settings: {e}")
+
+    @Slot()
+    def _open_body_editor(self):
+        """Swap the body label for an editable QTextEdit (created once, on first edit)."""
+        if self.body_view is not None:
+            self.body_view.setFocus()
+            return
+        editor = QTextEdit()
+        # Rendre le corps éditable et persister automatiquement
+        editor.setReadOnly(False)
+        editor.setPlainText(self.body_label.text())
+        editor.setWordWrapMode(QTextOption.WordWrap)
+        editor.textChanged.connect(self._persist_timer.start)
+        self._left_layout.replaceWidget(self.body_label, editor)
+        self.body_label.deleteLater()
+        self.body_label = None
+        self.body_view = editor
+        self.edit_body_btn.hide()
+        editor.setFocus()
+
     def _mm_to_pixels(self, mm: float, dpi: float = 96.0) -> float:
         # 1 inch = 25.4 mm
         return (mm / 25.4) * dpi
@@ -215,18 +416,34 @@ class StopoverEmailPreviewItem(QWidget):
             except Exception as e:
                 print(f"[StopoverEmailPreviewItem] send one failed: {e}")
 
+    def flush_pending_edits(self):
+        """Persist a pending debounced body edit right away (e.g. before the item is destroyed)."""
+        try:
+            if self._persist_timer.isActive():
+                self._persist_timer.stop()
+                self._auto_persist_body()
+        except Exception:
+            pass
+
     def _auto_persist_body(self):
         """Persist the current edited body for this stopover immediately."""
         try:
             # Persist per-stopover override using StopoverEmailService config,
             # since ConfigManager no longer exposes generic get/set for arbitrary keys.
+            if self.body_view is None:
+                return
+            body = self.body_view.toPlainText()
+            if body == self._persisted_body:
+                # Edits were undone (or only formatting changed): nothing to write
+                return
             code_uc = (self.stopover.code or "").upper()
-            svc = StopoverEmailService()
+            svc = _shared_stopover_email_service()
             cfg = svc.get_config(code_uc)
             # Keep current subject/body text from the item
             cfg.subject_template = self.subject
-            cfg.body_template = self.body_view.toPlainText()
+            cfg.body_template = body
             svc.save_config(cfg)
+            self._persisted_body = body
         except Exception as e:
             # Non bloquant
             print(f"[StopoverEmailPreviewItem] auto persist failed: {e}")
@@ -253,9 +470,41 @@ class EmailPreviewTabWidget(QWidget):
         self._mappings: Dict[str, List[str]] = {}
         self._mapping_service = MappingService()
         self._email_service = EmailService()
-        self._stopover_email_service = StopoverEmailService()
+        self._stopover_email_service = _shared_stopover_email_service()
         # Unified per-stopover configs cache { CODE: {"to":[], "cc":[], "bcc":[] } }
         self._email_configs: Dict[str, Dict[str, List[str]]] = {}
+        # Stopover list the current items were built from (filters hide/show those items)
+        self._items_built_for: Optional[List[Stopover]] = None
+        # Bulk send in progress (see _send_all_stopovers)
+        self._send_all_worker: Optional[_SendAllWorker] = None
+        self._send_all_sent_codes: List[str] = []
+        self._send_all_skipped = 0
+        # Items of the current build, in layout order
+        self._preview_items: List["StopoverEmailPreviewItem"] = []
+        # (overrides, subject_template, body_template) while items are still being added
+        # in batches (see _build_more_items), None once the build is complete
+        self._build_ctx: Optional[Tuple[Dict[str, Dict[str, str]], str, str]] = None
+        # ids of the stopovers matching the filters, for items added after the last filter pass
+        self._visible_ids: Set[int] = set()
+        # Lazy preview scan state, as parallel arrays indexed like _preview_items:
+        # the item's PdfPreview (or None) and its vertical extent in scroll content
+        # coordinates, plus the indexes whose preview was rendered by the scan
+        self._row_previews: List[Optional[PdfPreview]] = []
+        self._row_tops = array("i")
+        self._row_bottoms = array("i")
+        self._rendered_rows: Set[int] = set()
+        self._row_geometry_dirty = True
+        # Single-shot timers by key, see _debounce()
+        self._debounce_timers: Dict[str, QTimer] = {}
+        # Global templates, re-read only after ConfigManager reports a templates change
+        self._templates_cache: Optional[Dict[str, str]] = None
+        try:
+            cm = get_config_manager()
+            cm.on_templates_changed(self._invalidate_templates_cache)
+            # Recipients/CC/BCC live in mappings: drop the configs cache so the next reader rebuilds it
+            cm.on_mappings_changed(self._invalidate_email_configs)
+        except Exception:
+            pass
         self._build_ui()
         # track last applied template to detect global template changes
         self._last_template = None
@@ -299,8 +548,8 @@ class EmailPreviewTabWidget(QWidget):
         header.addWidget(self.presence_combo)
 
         # Now connect signals
-        self.filter_combo.currentIndexChanged.connect(self._rebuild_items_async)
-        self.presence_combo.currentIndexChanged.connect(self._rebuild_items_async)
+        self.filter_combo.currentIndexChanged.connect(self._on_filters_changed)
+        self.presence_combo.currentIndexChanged.connect(self._on_filters_changed)
 
         header.addStretch(1)
 
@@ -314,6 +563,12 @@ class EmailPreviewTabWidget(QWidget):
         self.send_all_button.clicked.connect(self._send_all_stopovers)
         header.addWidget(self.send_all_button)
 
+        # Determinate bulk send progress (jobs handled / total), shown only while sending
+        self.send_all_progress = QProgressBar(self)
+        self.send_all_progress.setFixedWidth(160)
+        self.send_all_progress.setVisible(False)
+        header.addWidget(self.send_all_progress)
+
 
         root.addLayout(header)
 
@@ -326,6 +581,10 @@ class EmailPreviewTabWidget(QWidget):
         self.scroll_layout.setContentsMargins(8, 8, 8, 8)
         self.scroll_layout.setSpacing(12)
         root.addWidget(self.scroll, 1)
+        # Render previews scrolled into view; bursts of wheel/drag events coalesce into one scan
+        vbar = self.scroll.verticalScrollBar()
+        vbar.valueChanged.connect(self._schedule_lazy_load)
+        vbar.rangeChanged.connect(self._on_scroll_range_changed)
 
         # Top: global template group (reusable by escales)
         self.template_group = QGroupBox("Modèle global")
@@ -357,23 +616,25 @@ class EmailPreviewTabWidget(QWidget):
         self.filename_pattern_edit.setToolTip("Utilisez {{stopover_code}} pour insérer le code d’escale. Exemple: Enquête - SATISFACTION - CLIENT -  {{stopover_code}}.pdf")
         # Load from config (fallback to placeholder if empty)
         try:
-            tpl = get_config_manager().get_templates()
-            current_pattern = (tpl.get("filename_pattern") or "").strip()
+            current_pattern = (self._templates().get("filename_pattern") or "").strip()
         except Exception:
             current_pattern = ""
         self.filename_pattern_edit.setText(current_pattern)
-        # Persist filename pattern immediately on edit
+        # Persist filename pattern shortly after the last keystroke. The items do not show the
+        # filename and sends read the live field, so nothing needs rebuilding.
         def _persist_filename_pattern():
             try:
+                pattern = self.filename_pattern_edit.text().strip()
+                if pattern == (self._templates().get("filename_pattern") or "").strip():
+                    return
                 from services.config_manager import get_config_manager as _gcm
-                cm = _gcm()
-                cm.set_filename_pattern(self.filename_pattern_edit.text().strip())
+                _gcm().set_filename_pattern(pattern)
             except Exception:
                 pass
-            # Rebuild items to reflect any preview text in the future
-            self._rebuild_items_async()
-        # Persist on each edit, but also initialize with default if empty in config (for packaged build fresh install)
-        self.filename_pattern_edit.textChanged.connect(_persist_filename_pattern)
+        # Persist after edits, but also initialize with default if empty in config (for packaged build fresh install)
+        self.filename_pattern_edit.textChanged.connect(
+            lambda _text: self._debounce("filename_pattern", 400, _persist_filename_pattern)
+        )
         if not current_pattern:
             # Initialize config with default on first run to ensure persistence in packaged builds
             try:
@@ -396,13 +657,7 @@ class EmailPreviewTabWidget(QWidget):
         self.template_body.setMinimumHeight(120)
 
         # Load current global subject/body from config manager
-        try:
-            t = get_config_manager().get_templates()
-            subj_value = t.get("subject") or "Rapport d’escale – {{stopover_code}}"
-            body_value = t.get("body") or self._email_service._get_default_template()
-        except Exception:
-            subj_value = "Rapport d’escale – {{stopover_code}}"
-            body_value = self._email_service._get_default_template()
+        subj_value, body_value = self._effective_templates()
 
         self.template_subject.setPlainText(subj_value)
         self.template_body.setPlainText(body_value)
@@ -433,13 +688,24 @@ class EmailPreviewTabWidget(QWidget):
     # ---------- Public API ----------
 
     def set_stopovers(self, stopovers: List[Stopover]):
-        self._stopovers = stopovers or []
+        stopovers = stopovers or []
+        if self._items_built_for is not None and self._items_built_for is self._stopovers and self._same_stopovers(stopovers):
+            # Same codes and pages as the items on screen: keep them
+            self._stopovers = stopovers
+            self._items_built_for = stopovers
+            return
+        self._stopovers = stopovers
         # reconstruire le contenu de la combo d'escales
         self._rebuild_stopover_filter_combo()
         self._rebuild_items_async()
 
     def set_pdf_path(self, path: Optional[str]):
         self._pdf_path = path
+        # Pages of the previous PDF will not be shown again
+        drop_cached_pages(keep_path=path)
+        # Warm the cache with the first pages while the user has not scrolled yet
+        if path and self._stopovers:
+            prefetch_pages(path, [self._page_number_of(s) for s in self._stopovers[:_PREFETCH_PAGES]])
         # Rebuild so each item can bind to the new pdf path for preview
         self._rebuild_items_async()
 
@@ -448,11 +714,12 @@ class EmailPreviewTabWidget(QWidget):
         self._pdf_path = None
         self._clear_items()
 
-    def refresh_recipients_from_configs(self):
-        # Called when mappings or dialog-saved configs change
+    def refresh_recipients_from_configs(self, all_cfgs: Optional[Dict[str, object]] = None):
+        # Called when mappings or dialog-saved configs change.
+        # all_cfgs: result of get_all_configs() when the caller already has it
         try:
-            svc = self._stopover_email_service
-            all_cfgs = svc.get_all_configs()
+            if all_cfgs is None:
+                all_cfgs = self._stopover_email_service.get_all_configs()
             self._email_configs = {
                 code: {
                     "to": list(cfg.recipients or []),
@@ -472,11 +739,98 @@ class EmailPreviewTabWidget(QWidget):
         # Intentionally do not trigger a refresh here; keep this method as a pure state update.
         # Callers (set_stopovers/set_pdf_path/_persist_templates_from_ui) already request refresh.
 
+    def update_item_recipients(self):
+        """Push current recipients to the built items (header only) and re-apply the filters."""
+        email_configs = self._ensure_email_configs()
+        for item in self._preview_items:
+            code_uc = (item.stopover.code or "").upper()
+            cfg = email_configs.get(code_uc)
+            try:
+                item.set_recipients(list(cfg.get("to", [])) if cfg else self._mappings.get(code_uc, []))
+            except Exception as e:
+                # One bad item must not keep the others stale
+                print(f"[EmailPreviewTabWidget] recipients update failed for {code_uc}: {e}")
+        # The "Avec/Sans email" filter depends on recipients
+        if self._preview_items:
+            self._apply_item_visibility()
+
+    def update_item_texts(self):
+        """Re-render subjects/bodies into the built items in place (after a template edit)."""
+        if self._items_built_for is not self._stopovers:
+            self._rebuild_items_async()
+            return
+        try:
+            all_cfgs = self._stopover_email_service.get_all_configs() or {}
+        except Exception:
+            all_cfgs = {}
+        subject_template, body_template = self._effective_templates()
+        overrides = self._overrides_from_configs(all_cfgs)
+        if self._build_ctx is not None:
+            # Items not created yet will render the new texts
+            self._build_ctx = (overrides, subject_template, body_template)
+        for item in self._preview_items:
+            item.set_texts(*self._item_texts(item.stopover, overrides, subject_template, body_template))
+
     # ---------- Internal ----------
 
+    @staticmethod
+    def _overrides_from_configs(all_cfgs: Dict[str, object]) -> Dict[str, Dict[str, str]]:
+        """Per-stopover subject/body overrides keyed by upper-case code."""
+        overrides: Dict[str, Dict[str, str]] = {}
+        try:
+            # Build a simple override dict view based on service configs
+            for code, cfg in all_cfgs.items():
+                overrides[str(code).upper()] = {
+                    "subject": getattr(cfg, "subject_template", "") or "",
+                    "body": getattr(cfg, "body_template", "") or "",
+                }
+        except Exception:
+            overrides = {}
+        return overrides
+
+    @staticmethod
+    def _item_texts(stopover: Stopover, overrides: Dict[str, Dict[str, str]], subject_template: str, body_template: str) -> Tuple[str, str]:
+        """Rendered (subject, body) for a stopover: its override if present, else the global template."""
+        ov = overrides.get((stopover.code or "").upper())
+        if ov:
+            return (
+                _render_template(ov.get("subject") or subject_template, stopover.code),
+                _render_template(ov.get("body") or body_template, stopover.code),
+            )
+        return _render_template(subject_template, stopover.code), _render_template(body_template, stopover.code)
+
+    def _invalidate_templates_cache(self, *_):
+        self._templates_cache = None
+
+    def _invalidate_email_configs(self, *_):
+        self._email_configs = {}
+
+    def _ensure_email_configs(self) -> Dict[str, Dict[str, List[str]]]:
+        """Per-stopover {to, cc, bcc} lists, rebuilt in one pass after a mappings change."""
+        if not self._email_configs:
+            self.refresh_recipients_from_configs()
+        return self._email_configs
+
+    def _templates(self) -> Dict[str, str]:
+        """Global templates from ConfigManager, cached until the next templates change."""
+        if self._templates_cache is None:
+            self._templates_cache = get_config_manager().get_templates()
+        return self._templates_cache
+
+    def _effective_templates(self) -> Tuple[str, str]:
+        """(subject, body) global templates with defaults applied."""
+        try:
+            t = self._templates()
+            subject_template = t.get("subject") or _DEFAULT_SUBJECT_TEMPLATE
+            body_template = t.get("body") or self._email_service._get_default_template()
+        except Exception:
+            subject_template = _DEFAULT_SUBJECT_TEMPLATE
+            body_template = self._email_service._get_default_template()
+        return subject_template, body_template
+
     def _persist_templates_from_ui(self):
         # Debounced-ish immediate persist of templates into unified config
-        subject_template = self.template_subject.toPlainText().strip() or "Rapport d’escale – {{stopover_code}}"
+        subject_template = self.template_subject.toPlainText().strip() or _DEFAULT_SUBJECT_TEMPLATE
         body_template = self.template_body.toPlainText().strip() or self._email_service._get_default_template()
         try:
             # Persist global templates via ConfigManager (no generic KV anymore)
@@ -505,8 +859,82 @@ class EmailPreviewTabWidget(QWidget):
             # Non-fatal; keep UI responsive
             print(f"[EmailPreviewTabWidget] Failed to persist templates: {e}")
 
-        # After persisting, refresh the stopover previews to reflect changes
-        self._rebuild_items_async()
+        # After persisting, refresh the stopover previews' texts in place
+        self.update_item_texts()
+
+    def _debounce(self, key: str, delay_ms: int, fn) -> None:
+        """(Re)start a single-shot timer for key; fn runs once after the last call within delay_ms."""
+        timer = self._debounce_timers.get(key)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(fn)
+            self._debounce_timers[key] = timer
+        timer.start(delay_ms)
+
+    def _schedule_lazy_load(self, *_):
+        self._debounce("lazy_load", 60, self._lazy_load_visible_previews)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Items built while the tab was hidden had nothing visible to render
+        self._schedule_lazy_load()
+
+    def _on_scroll_range_changed(self, *_):
+        # Content height changed: item positions must be measured again
+        self._row_geometry_dirty = True
+        self._schedule_lazy_load()
+
+    def _refresh_row_geometry(self):
+        # Items are laid out top to bottom inside items_container
+        offset = self.items_container.y()
+        tops = array("i")
+        bottoms = array("i")
+        last_bottom = offset
+        for item in self._preview_items:
+            if item.isHidden():
+                # Filtered out: empty extent that keeps the arrays sorted
+                tops.append(last_bottom)
+                bottoms.append(last_bottom)
+                continue
+            y = offset + item.y()
+            last_bottom = y + item.height()
+            tops.append(y)
+            bottoms.append(last_bottom)
+        self._row_tops = tops
+        self._row_bottoms = bottoms
+        self._row_geometry_dirty = False
+
+    def _lazy_load_visible_previews(self):
+        """
+        Render the deferred PDF previews intersecting the viewport (plus one screen
+        of prefetch on each side) and release the ones far away from it.
+        """
+        if not self._row_previews or not self.isVisible():
+            return
+        if self._row_geometry_dirty:
+            self._refresh_row_geometry()
+        view_h = self.scroll.viewport().height()
+        top = self.scroll.verticalScrollBar().value() - view_h
+        bottom = top + 3 * view_h
+        tops = self._row_tops
+        bottoms = self._row_bottoms
+        previews = self._row_previews
+        rendered = self._rendered_rows
+        # Rows are sorted and do not overlap: jump to the first one reaching the band
+        i = bisect_left(bottoms, top)
+        n = len(previews)
+        while i < n and tops[i] <= bottom:
+            preview = previews[i]
+            if preview is not None and i not in rendered and bottoms[i] > tops[i]:
+                preview.ensureRendered()
+                rendered.add(i)
+            i += 1
+        release_top = top - 2 * view_h
+        release_bottom = bottom + 2 * view_h
+        for i in [i for i in rendered if bottoms[i] < release_top or tops[i] > release_bottom]:
+            previews[i].releaseRender()
+            rendered.discard(i)
 
     def _clear_items(self):
         # Preserve current scroll position to avoid jumping after rebuilds
@@ -514,10 +942,17 @@ class EmailPreviewTabWidget(QWidget):
             scroll_pos = self.scroll.verticalScrollBar().value() if hasattr(self, "scroll") else None
         except Exception:
             scroll_pos = None
+        self._preview_items = []
+        self._build_ctx = None
+        self._row_previews = []
+        self._rendered_rows = set()
+        self._row_geometry_dirty = True
         while self.items_layout.count():
             item = self.items_layout.takeAt(0)
             w = item.widget()
             if w:
+                if isinstance(w, StopoverEmailPreviewItem):
+                    w.flush_pending_edits()
                 w.setParent(None)
                 w.deleteLater()
         # Restore scroll position if possible
@@ -531,9 +966,19 @@ class EmailPreviewTabWidget(QWidget):
         # Skip during initial construction to prevent empty-first render
         if getattr(self, "_initializing", False):
             return
-        QTimer.singleShot(0, self._rebuild_items)
+        # Coalesce: several requests within one event-loop pass give a single rebuild
+        self._debounce("rebuild", 0, self._rebuild_items)
 
     def _rebuild_items(self):
+        # Suspend repaints while the items are torn down and re-added; each insertion would
+        # otherwise trigger its own layout/paint pass over the whole container
+        self.items_container.setUpdatesEnabled(False)
+        try:
+            self._populate_items()
+        finally:
+            self.items_container.setUpdatesEnabled(True)
+
+    def _populate_items(self):
         self._clear_items()
         if not self._stopovers:
             info = QLabel("Aucune escale détectée.")
@@ -544,10 +989,16 @@ class EmailPreviewTabWidget(QWidget):
         if self.filter_combo.count() <= 1:
             self._rebuild_stopover_filter_combo()
 
+        # One snapshot of the per-stopover configs serves recipients and overrides below
+        try:
+            all_cfgs = self._stopover_email_service.get_all_configs() or {}
+        except Exception:
+            all_cfgs = {}
+
         # Ensure we have latest configs (preferred) and legacy mappings as fallback
         try:
             if not getattr(self, "_email_configs", None):
-                self.refresh_recipients_from_configs()
+                self.refresh_recipients_from_configs(all_cfgs)
         except Exception:
             # Soft-fail: keep legacy behavior
             try:
@@ -557,55 +1008,49 @@ class EmailPreviewTabWidget(QWidget):
                 self._mappings = {}
 
         # Pull current global templates once
-        try:
-            t = get_config_manager().get_templates()
-            subject_template = t.get("subject") or "Rapport d’escale – {{stopover_code}}"
-            body_template = t.get("body") or self._email_service._get_default_template()
-        except Exception:
-            subject_template = "Rapport d’escale – {{stopover_code}}"
-            body_template = self._email_service._get_default_template()
+        subject_template, body_template = self._effective_templates()
 
         # Load per-stopover overrides from unified StopoverEmailService configs
-        overrides: Dict[str, Dict[str, str]] = {}
+        overrides = self._overrides_from_configs(all_cfgs)
+
+        # One item per stopover; the filters only hide/show items (see _apply_item_visibility).
+        # Only the first batch is created now so the tab shows up at once; the rest follow
+        # in later event-loop passes
+        self._items_built_for = self._stopovers
+        self._build_ctx = (overrides, subject_template, body_template)
+        self._visible_ids = {id(s) for s in self._visible_stopovers()}
+        self._build_more_items()
+
+    def _build_more_items(self):
+        ctx = self._build_ctx
+        if ctx is None or self._items_built_for is not self._stopovers:
+            # Cleared or superseded by a rebuild
+            return
+        overrides, subject_template, body_template = ctx
+        start = len(self._preview_items)
+        batch = self._stopovers[start:start + _ITEM_BUILD_BATCH]
+        visible = self._visible_ids
+        self.items_container.setUpdatesEnabled(False)
         try:
-            svc = self._stopover_email_service
-            # Build a simple override dict view based on service configs
-            for code, cfg in (svc.get_all_configs() or {}).items():
-                overrides[str(code).upper()] = {
-                    "subject": getattr(cfg, "subject_template", "") or "",
-                    "body": getattr(cfg, "body_template", "") or "",
-                }
-        except Exception:
-            overrides = {}
-
-        # Appliquer les filtres
-        filtered = self._apply_filters(self._stopovers)
-    
-        # Fallbacks to guarantee non-empty default view when presence mode is "all"
-        mode_code = self._current_presence_mode()
-        sel_txt = self.filter_combo.currentText() if hasattr(self, "filter_combo") else "Toutes les escales"
-        if not filtered and (mode_code == "all"):
-            # If user intends to see all, show all regardless of mappings readiness
-            filtered = list(self._stopovers)
-        if not filtered and (mode_code == "all") and (sel_txt.strip().upper() in ("TOUTES LES ESCALES", "")):
-            # If global filter is all, also default to all
-            filtered = list(self._stopovers)
+            self._add_items(batch, overrides, subject_template, body_template, visible)
+        finally:
+            self.items_container.setUpdatesEnabled(True)
+        self._row_geometry_dirty = True
+        if len(self._preview_items) < len(self._stopovers):
+            self._debounce("build_more", 0, self._build_more_items)
+        else:
+            self._build_ctx = None
+        self._schedule_lazy_load()
 
-        for s in filtered:
+    def _add_items(self, stopovers: List[Stopover], overrides: Dict[str, Dict[str, str]], subject_template: str, body_template: str, visible: Set[int]):
+        for s in stopovers:
             code_uc = (s.code or "").upper()
             # Prefer unified configs for recipients; fallback to legacy mappings
             if getattr(self, "_email_configs", None) and code_uc in self._email_configs:
                 recipients = list(self._email_configs[code_uc].get("to", []))
             else:
                 recipients = self._mappings.get(code_uc, [])
-            # Apply overrides per stopover if present, else use template
-            ov = overrides.get(code_uc) if isinstance(overrides, dict) else None
-            if ov and isinstance(ov, dict):
-                subject = (ov.get("subject") or subject_template).replace("{{stopover_code}}", s.code)
-                body = (ov.get("body") or body_template).replace("{{stopover_code}}", s.code)
-            else:
-                subject = subject_template.replace("{{stopover_code}}", s.code)
-                body = body_template.replace("{{stopover_code}}", s.code)
+            subject, body = self._item_texts(s, overrides, subject_template, body_template)
 
             # Use page size if available on stopover; fallback to A4
             page_mm = self._extract_page_size_mm(s)
@@ -620,6 +1065,54 @@ class EmailPreviewTabWidget(QWidget):
                 on_send_one=self._send_one_stopover,
             )
             self.items_layout.addWidget(item)
+            item.setVisible(id(s) in visible)
+            self._preview_items.append(item)
+            self._row_previews.append(item.pdf_preview)
+
+    def _same_stopovers(self, stopovers: List[Stopover]) -> bool:
+        if len(stopovers) != len(self._stopovers):
+            return False
+        return all(
+            a.code == b.code and getattr(a, "page_number", None) == getattr(b, "page_number", None)
+            for a, b in zip(stopovers, self._stopovers)
+        )
+
+    def _visible_stopovers(self) -> List[Stopover]:
+        """Stopovers matching the current filters."""
+        # Appliquer les filtres
+        filtered = self._apply_filters(self._stopovers)
+
+        # Fallbacks to guarantee non-empty default view when presence mode is "all"
+        mode_code = self._current_presence_mode()
+        sel_txt = self.filter_combo.currentText() if hasattr(self, "filter_combo") else "Toutes les escales"
+        if not filtered and (mode_code == "all"):
+            # If user intends to see all, show all regardless of mappings readiness
+            filtered = list(self._stopovers)
+        if not filtered and (mode_code == "all") and (sel_txt.strip().upper() in ("TOUTES LES ESCALES", "")):
+            # If global filter is all, also default to all
+            filtered = list(self._stopovers)
+        return filtered
+
+    def _apply_item_visibility(self):
+        visible = self._visible_ids = {id(s) for s in self._visible_stopovers()}
+        # Items were built one per stopover, in order
+        for s, item in zip(self._stopovers, self._preview_items):
+            item.setVisible(id(s) in visible)
+        # Row positions moved even if the total height did not
+        self._row_geometry_dirty = True
+        self._schedule_lazy_load()
+
+    def _on_filters_changed(self, *_):
+        # Items already built for the current stopovers: filtering is just hide/show
+        if self._preview_items and self._items_built_for is self._stopovers:
+            self._apply_item_visibility()
+        else:
+            self._rebuild_items_async()
+
+    @staticmethod
+    def _page_number_of(stopover: Stopover) -> int:
+        page_num = getattr(stopover, "page_number", 1)
+        return page_num if isinstance(page_num, int) and page_num > 0 else 1
 
     def _extract_page_size_mm(self, stopover: Stopover) -> Tuple[float, float]:
         """
@@ -698,11 +1191,11 @@ class EmailPreviewTabWidget(QWidget):
                 return
             service = self._email_service
             attachment = self._build_attachment_for_stopover(stopover)
-            # Fetch CC/BCC from unified config
+            # Fetch CC/BCC from the unified configs cache
             code_uc = (stopover.code or "").upper()
-            cfg = self._stopover_email_service.get_config(code_uc)
-            cc_list = list(getattr(cfg, "cc_recipients", []) or [])
-            bcc_list = list(getattr(cfg, "bcc_recipients", []) or [])
+            cfg = self._ensure_email_configs().get(code_uc) or {}
+            cc_list = list(cfg.get("cc", []))
+            bcc_list = list(cfg.get("bcc", []))
             ok = service.send_email(
                 to_emails=recipients,
                 subject=subject,
@@ -742,19 +1235,16 @@ class EmailPreviewTabWidget(QWidget):
         if not self._stopovers:
             QMessageBox.information(self, "Info", "Aucune escale à envoyer.")
             return
+        if self._send_all_worker is not None:
+            # A bulk send is already running
+            return
         # Confirm
-        reply = QMessageBox.question(self, "Confirmation", "Envoyer pour toutes les escales filtrées ?")
+        reply = QMessageBox.question(self, "Confirmation", "Envoyer pour toutes les escales filtrées ?")
         if reply != QMessageBox.Yes:
             return
 
         # Pull current templates
-        try:
-            t = get_config_manager().get_templates()
-            subject_template = t.get("subject") or "Rapport d’escale – {{stopover_code}}"
-            body_template = t.get("body") or self._email_service._get_default_template()
-        except Exception:
-            subject_template = "Rapport d’escale – {{stopover_code}}"
-            body_template = self._email_service._get_default_template()
+        subject_template, body_template = self._effective_templates()
 
         # Load overrides map for sending
         try:
@@ -762,62 +1252,69 @@ class EmailPreviewTabWidget(QWidget):
         except Exception:
             overrides = {}
 
-        sent_count = 0
+        # Recipients for every stopover from one configs snapshot (also refreshes the filters' view)
+        email_configs = self._ensure_email_configs()
+
+        # Resolve everything that touches widgets or config here, on the GUI thread;
+        # the worker only builds attachments and talks to Outlook
+        jobs: List[_SendJob] = []
         skipped_no_rec = 0
         # Always ignore stopovers without recipients (safer default)
         ignore_empty = True
 
         for s in self._apply_filters(self._stopovers):
-            try:
-                code_uc = (s.code or "").upper()
-                cfg = self._stopover_email_service.get_config(code_uc)
-                recipients = list(cfg.recipients or [])
-                if not recipients and ignore_empty:
-                    skipped_no_rec += 1
-                    continue
-                ov = overrides.get(code_uc) if isinstance(overrides, dict) else None
-                if ov and isinstance(ov, dict):
-                    subject = (ov.get("subject") or subject_template).replace("{{stopover_code}}", s.code)
-                    body = (ov.get("body") or body_template).replace("{{stopover_code}}", s.code)
-                else:
-                    subject = subject_template.replace("{{stopover_code}}", s.code)
-                    body = body_template.replace("{{stopover_code}}", s.code)
-                attachment = self._build_attachment_for_stopover(s)
-                ok = self._email_service.send_email(
-                    to_emails=recipients,
-                    subject=subject,
-                    body=body,
-                    attachment_path=attachment,
-                    cc_emails=list(cfg.cc_recipients or []),
-                    bcc_emails=list(cfg.bcc_recipients or []),
-                )
-                if ok:
-                    try:
-                        # Persist last_sent so MappingTab's "Dernier envoi" updates
-                        self._stopover_email_service.set_last_sent_now(code_uc)
-                        # Force MappingTab immediate refresh if available
-                        try:
-                            w = self.parent()
-                            mw = None
-                            while w is not None:
-                                if hasattr(w, "mapping_tab") and hasattr(w.mapping_tab, "load_mappings"):
-                                    mw = w
-                                    break
-                                w = w.parent()
-                            if mw is not None:
-                                mw.mapping_tab.load_mappings()
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
-                    sent_count += 1
-            except Exception as e:
-                print(f"[EmailPreviewTabWidget] send all failed for {s.code}: {e}")
-
+            code_uc = (s.code or "").upper()
+            cfg = email_configs.get(code_uc) or {}
+            recipients = list(cfg.get("to", []))
+            if not recipients and ignore_empty:
+                skipped_no_rec += 1
+                continue
+            ov = overrides.get(code_uc) if isinstance(overrides, dict) else None
+            if ov and isinstance(ov, dict):
+                subject = _render_template(ov.get("subject") or subject_template, s.code)
+                body = _render_template(ov.get("body") or body_template, s.code)
+            else:
+                subject = _render_template(subject_template, s.code)
+                body = _render_template(body_template, s.code)
+            jobs.append(_SendJob(s, code_uc, recipients, list(cfg.get("cc", [])), list(cfg.get("bcc", [])), subject, body))
+
+        self._send_all_skipped = skipped_no_rec
+        self._send_all_sent_codes = []
+        self.send_all_button.setEnabled(False)
+        worker = _SendAllWorker(
+            self._email_service.for_worker_thread(), jobs, self._pdf_path, self._current_filename_pattern()
+        )
+        worker.item_sent.connect(self._on_send_all_item_sent)
+        worker.item_done.connect(self._on_send_all_item_done)
+        worker.finished.connect(self._on_send_all_finished)
+        self.send_all_progress.setRange(0, max(1, len(jobs)))
+        self.send_all_progress.setValue(0)
+        self.send_all_progress.setVisible(True)
+        self._send_all_worker = worker
+        _SEND_POOL.submit(worker.run)
+
+    def _on_send_all_item_sent(self, code_uc: str):
+        # Back on the GUI thread (queued from the worker); last_sent is persisted once at the end
+        self._send_all_sent_codes.append(code_uc)
+
+    def _on_send_all_item_done(self):
+        self.send_all_progress.setValue(self.send_all_progress.value() + 1)
+
+    def _on_send_all_finished(self):
+        self._send_all_worker = None
+        self.send_all_button.setEnabled(True)
+        self.send_all_progress.setVisible(False)
+        sent_codes, self._send_all_sent_codes = self._send_all_sent_codes, []
+        try:
+            # Persist last_sent in one write; MappingTab's "Dernier envoi" refreshes from the
+            # resulting on_last_sent_changed notification
+            self._stopover_email_service.set_last_sent_now_batch(sent_codes)
+        except Exception:
+            pass
         # Simple summary message after bulk send (requested)
-        msg = f"Envois effectués : {sent_count}"
-        if skipped_no_rec:
-            msg += f"\nIgnorés (sans destinataire) : {skipped_no_rec}"
+        msg = f"Envois effectués : {len(sent_codes)}"
+        if self._send_all_skipped:
+            msg += f"\nIgnorés (sans destinataire) : {self._send_all_skipped}"
         QMessageBox.information(self, "Terminé", msg)
 
     def _build_attachment_for_stopover(self, stopover: Stopover) -> Optional[str]:
@@ -825,64 +1322,29 @@ class EmailPreviewTabWidget(QWidget):
         Build a one-page PDF attachment for the given stopover from the current PDF.
         Only the page corresponding to the stopover is included, as requested.
         """
-        import os
-        import tempfile
-        import re
+        if not self._pdf_path:
+            return None
         try:
-            if not self._pdf_path:
-                return None
-            page_num = getattr(stopover, "page_number", 1)
-            if not isinstance(page_num, int) or page_num <= 0:
-                page_num = 1
-            # Resolve filename pattern: prefer live UI field; fallback to config; default literal
-            default_pattern = "Enquête - SATISFACTION - CLIENT -  {{stopover_code}}.pdf"
-            pattern = default_pattern
-            try:
-                if hasattr(self, "filename_pattern_edit") and isinstance(self.filename_pattern_edit, QLineEdit):
-                    txt = self.filename_pattern_edit.text().strip()
-                    if txt:
-                        pattern = txt
-                else:
-                    tpl = get_config_manager().get_templates()
-                    txt = (tpl.get("filename_pattern") or "").strip()
-                    if txt:
-                        pattern = txt
-            except Exception:
-                pass
-            # Render pattern
-            code_val = (getattr(stopover, "code", "") or "")
-            # Support both legacy {{stopovercode}} and new {{stopover_code}} tokens
-            rendered = pattern.replace("{{stopover_code}}", code_val).replace("{{stopovercode}}", code_val)
-            # Ensure .pdf suffix
-            if not rendered.lower().endswith(".pdf"):
-                rendered = f"{rendered}.pdf"
-            # Sanitize Windows-invalid chars
-            rendered = re.sub(r'[\\/:*?"<>|]+', "-", rendered).strip().strip(".")
-            # Fallback if empty after sanitize
-            if not rendered:
-                rendered = default_pattern.replace("{{stopovercode}}", code_val)
-            # Ensure uniqueness in temp dir
-            tmp_dir = tempfile.gettempdir()
-            final_name = rendered
-            base_name, ext = os.path.splitext(final_name)
-            candidate = os.path.join(tmp_dir, final_name)
-            idx = 1
-            while os.path.exists(candidate):
-                candidate = os.path.join(tmp_dir, f"{base_name}-{idx}{ext}")
-                idx += 1
-
-            # Create a temporary single-page PDF using PyMuPDF
-            import fitz  # PyMuPDF
-            with fitz.open(self._pdf_path) as src:
-                if page_num < 1 or page_num > len(src):
-                    return self._pdf_path  # fallback: whole PDF
-                with fitz.open() as dst:
-                    dst.insert_pdf(src, from_page=page_num - 1, to_page=page_num - 1)
-                    dst.save(candidate)
-            return candidate if os.path.exists(candidate) else self._pdf_path
+            attachment = PDFAttachmentService.create_stopover_attachment(
+                self._pdf_path, stopover, filename_pattern=self._current_filename_pattern()
+            )
+        except Exception:
+            attachment = None
+        # In case of any failure, fallback to sending the whole file
+        return attachment or self._pdf_path
+
+    def _current_filename_pattern(self) -> str:
+        """Resolve filename pattern: prefer live UI field; fallback to config; default literal."""
+        try:
+            if hasattr(self, "filename_pattern_edit") and isinstance(self.filename_pattern_edit, QLineEdit):
+                txt = self.filename_pattern_edit.text().strip()
+            else:
+                txt = (self._templates().get("filename_pattern") or "").strip()
+            if txt:
+                return txt
         except Exception:
-            # In case of any failure, fallback to sending the whole file
-            return self._pdf_path
+            pass
+        return DEFAULT_FILENAME_PATTERN
 
     def _rebuild_stopover_filter_combo(self):
         # Remplit la combo avec "Toutes les escales" + codes triés
@@ -892,18 +1354,17 @@ class EmailPreviewTabWidget(QWidget):
             current = "Toutes les escales"
         if not hasattr(self, "filter_combo"):
             return
-        self.filter_combo.blockSignals(True)
-        self.filter_combo.clear()
-        self.filter_combo.addItem("Toutes les escales")
-        codes = sorted({(s.code or "").upper() for s in (self._stopovers or []) if getattr(s, "code", None)})
-        for c in codes:
-            self.filter_combo.addItem(c)
-        # restaurer sélection si possible
-        if current and current in [self.filter_combo.itemText(i) for i in range(self.filter_combo.count())]:
-            self.filter_combo.setCurrentText(current)
-        else:
-            self.filter_combo.setCurrentIndex(0)
-        self.filter_combo.blockSignals(False)
+        with QSignalBlocker(self.filter_combo):
+            self.filter_combo.clear()
+            self.filter_combo.addItem("Toutes les escales")
+            codes = sorted({(s.code or "").upper() for s in (self._stopovers or []) if getattr(s, "code", None)})
+            for c in codes:
+                self.filter_combo.addItem(c)
+            # restaurer sélection si possible
+            if current and current in [self.filter_combo.itemText(i) for i in range(self.filter_combo.count())]:
+                self.filter_combo.setCurrentText(current)
+            else:
+                self.filter_combo.setCurrentIndex(0)
         # End of initialization: subsequent changes can trigger rebuilds
         if getattr(self, "_initializing", False):
             self._initializing = False
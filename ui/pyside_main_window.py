@@ -11,8 +11,9 @@ This file provides a behavior-parity UI with the former Tkinter MainWindow:
 from typing import List, Optional, Set, Callable
 import os
 import sys
+import threading
 
-from PySide6.QtCore import Qt, QSize, QTimer, Slot
+from PySide6.QtCore import Qt, QSize, QTimer, Slot, Signal, QObject, QSignalBlocker
 from PySide6.QtGui import QAction, QIcon, QDesktopServices
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFileDialog, QMessageBox, QLabel, QPushButton,
@@ -30,14 +31,57 @@ from ui.pyside_mapping_tab import MappingTabWidget
 from ui.pyside_email_preview_tab import EmailPreviewTabWidget
 
 
+class _OutlookProbeWorker(QObject):
+    """Reads Outlook identity/accounts off the GUI thread (COM dispatch can block for seconds)."""
+    finished = Signal(dict)
+
+    def __init__(self, email_service):
+        super().__init__()
+        self._email_service = email_service
+
+    def run(self):
+        try:
+            info = self._email_service.probe_outlook()
+        except Exception:
+            info = {}
+        self.finished.emit(info or {})
+
+
+class _GuiThreadBridge(QObject):
+    """
+    Runs callables on the GUI thread.
+
+    post() may be called from any thread: the signal is queued to the bridge's (GUI) thread
+    when emitted elsewhere, and delivered directly when already on it.
+    """
+    _invoke = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._invoke.connect(self._run)
+
+    @Slot(object)
+    def _run(self, fn):
+        fn()
+
+    def post(self, fn, *args):
+        self._invoke.emit(lambda: fn(*args))
+
+
 class MainWindowQt(QMainWindow):
     """Main application window using PySide6 components."""
 
+    _PDF_FILE_FILTER = "Fichiers PDF (*.pdf);;Tous les fichiers (*)"
+
     def __init__(self, parent=None):
         super().__init__(parent)
         # Services and controller
         self.config_service = ConfigService()
         self.controller = AppController()
+        # A PDF analysis thread is in flight (PDF selection is disabled meanwhile)
+        self._analysis_running = False
+        # Folder of the last PDF picked this session; the file dialog reopens there
+        self._last_pdf_dir = ""
 
         # Window setup
         self._setup_window()
@@ -215,17 +259,32 @@ class MainWindowQt(QMainWindow):
         sb.addPermanentWidget(self._help_btn)
 
     def _setup_controller_callbacks(self):
-        self.controller.on_status_update = self._enqueue_status_update
-        self.controller.on_progress_start = self._start_progress
-        self.controller.on_progress_stop = self._stop_progress
-        self.controller.on_analysis_complete = self._on_analysis_complete
-        self.controller.on_outlook_connection_change = self._on_outlook_connection_change
+        # The controller calls these from its analysis thread too: every widget update is
+        # marshalled onto the GUI thread
+        self._gui_bridge = _GuiThreadBridge(self)
+        # Connection state changes arrive in bursts (connect, retry, reconnect): only the
+        # latest one is applied, 150 ms after the first of the burst
+        self._pending_conn: Optional[tuple] = None
+        self._conn_timer = QTimer(self)
+        self._conn_timer.setSingleShot(True)
+        self._conn_timer.setInterval(150)
+        self._conn_timer.timeout.connect(self._apply_outlook_connection_state)
+        # Mapping edits come in runs (paste, several rows): reconcile once 200 ms after the last
+        self._mappings_timer = QTimer(self)
+        self._mappings_timer.setSingleShot(True)
+        self._mappings_timer.setInterval(200)
+        self._mappings_timer.timeout.connect(self._do_mappings_change)
+        post = self._gui_bridge.post
+        self.controller.on_status_update = lambda message: post(self._update_status, message)
+        self.controller.on_progress_start = lambda: post(self._start_progress)
+        self.controller.on_progress_stop = lambda: post(self._on_analysis_stopped)
+        self.controller.on_analysis_complete = lambda stopovers: post(self._on_analysis_complete, stopovers)
+        self.controller.on_outlook_connection_change = (
+            lambda connected, user: post(self._on_outlook_connection_change, connected, user)
+        )
 
-        # Populate Outlook accounts once controller is available
-        try:
-            self._refresh_outlook_accounts()
-        except Exception:
-            pass
+        # Populate Outlook accounts once controller is available, without blocking startup
+        self._start_outlook_probe()
 
     def _initialize_state(self):
         # Load initial mappings
@@ -234,13 +293,17 @@ class MainWindowQt(QMainWindow):
     # ========== Behavior parity methods ==========
 
     def _select_pdf(self):
+        if self._analysis_running:
+            # The running analysis owns the controller's PDF state until it finishes
+            return
         filename, _ = QFileDialog.getOpenFileName(
             self,
             "Sélectionner un fichier PDF",
-            "",
-            "Fichiers PDF (*.pdf);;Tous les fichiers (*)",
+            self._last_pdf_dir,
+            self._PDF_FILE_FILTER,
         )
         if filename:
+            self._last_pdf_dir = os.path.dirname(filename)
             if self.controller.set_pdf_path(filename):
                 self.file_label.setText(f"Sélectionné : {os.path.basename(filename)}")
                 
@@ -258,7 +321,10 @@ class MainWindowQt(QMainWindow):
                 # Start analysis automatically
                 self.status_label.setText("Analyse du PDF…")
                 self._start_progress()
-                self.controller.analyze_pdf()
+                self._analysis_running = True
+                self.select_button.setEnabled(False)
+                if not self.controller.analyze_pdf():
+                    self._on_analysis_stopped()
             else:
                 QMessageBox.critical(self, "Erreur", "Veuillez sélectionner un fichier PDF valide.")
 
@@ -268,9 +334,8 @@ class MainWindowQt(QMainWindow):
         # Update stopover tab
         self.stopover_tab.set_stopovers(stopovers)
 
-        # Mapping tab with found stopovers
-        found_codes = {s.code for s in stopovers}
-        self.mapping_tab.set_found_stopovers(found_codes)
+        # Mapping tab with found stopovers (the controller's frozenset, built once per analysis)
+        self.mapping_tab.set_found_stopovers(self.controller.found_stopover_codes)
 
         # Email preview tab
         self.email_preview_tab.set_stopovers(stopovers)
@@ -281,45 +346,47 @@ class MainWindowQt(QMainWindow):
         self._stop_progress()
 
     def _update_status(self, message: str):
-        # Immediate UI-thread safe setter (used internally after queueing)
+        # GUI thread only (controller updates arrive through _gui_bridge)
         self.status_label.setText(message)
 
-    def _enqueue_status_update(self, message: str):
-        # Ensure status label updates occur on the GUI thread
-        QTimer.singleShot(0, lambda: self._update_status(message))
-
     def _start_progress(self):
         self.progress_bar.setVisible(True)
 
     def _stop_progress(self):
         self.progress_bar.setVisible(False)
+
+    def _on_analysis_stopped(self):
+        # Posted by the analysis thread when it ends, whether it succeeded or not
+        self._analysis_running = False
+        self.select_button.setEnabled(True)
+        self._stop_progress()
         
 
     def _on_mappings_change(self):
-        # Refresh mapping display
-        self.mapping_tab.load_mappings()
-        # Reflect changes in Email Preview
-        try:
-            self.email_preview_tab.refresh_recipients_from_configs()
-        except Exception:
-            try:
-                self.email_preview_tab.set_stopovers(self.controller.stopovers or [])
-                if self.controller.current_pdf_path:
-                    self.email_preview_tab.set_pdf_path(self.controller.current_pdf_path)
-            except Exception:
-                pass
-        # Additionally, when configs are updated elsewhere (e.g., StopoverEmailSettingsDialog),
-        # ensure the Mapping tab reflects unified mappings immediately.
-        try:
-            self.mapping_tab.load_mappings()
-        except Exception:
-            pass
+        self._mappings_timer.start()
+
+    def _do_mappings_change(self):
+        # Refresh mapping display (one coalesced reload; the tab also follows ConfigManager
+        # notifications, e.g. for configs saved from StopoverEmailSettingsDialog)
+        self.mapping_tab.schedule_load_mappings()
+        # Reflect changes in Email Preview: recipient lines are updated in place. Both calls
+        # handle their own failures, so there is no full-rebuild fallback here
+        self.email_preview_tab.refresh_recipients_from_configs()
+        self.email_preview_tab.update_item_recipients()
 
     def _on_stopover_select(self, stopover):
         # Delegate to stopover tab: it handles rendering preview and status updates
         self.stopover_tab.load_page_preview(stopover, self._update_status)
 
     def _on_outlook_connection_change(self, connected: bool, user: Optional[str]):
+        self._pending_conn = (connected, user)
+        if not self._conn_timer.isActive():
+            self._conn_timer.start()
+
+    def _apply_outlook_connection_state(self):
+        if self._pending_conn is None:
+            return
+        self._pending_conn = None
         # Refresh detected sender and accounts list whenever Outlook state changes
         try:
             self._refresh_outlook_accounts()
@@ -327,7 +394,6 @@ class MainWindowQt(QMainWindow):
             pass
 
         # No separate label to update anymore
-        pass
 
     # Removed connect/manage buttons; using a single dropdown instead
     def _toggle_outlook_connection(self):
@@ -358,52 +424,65 @@ class MainWindowQt(QMainWindow):
             except Exception:
                 QMessageBox.warning(self, "Aide", "Impossible d'ouvrir le lien.")
 
-    def _refresh_outlook_accounts(self):
-        """Populate the Outlook accounts dropdown and update status label."""
+    def _start_outlook_probe(self):
+        """Enumerate Outlook accounts in a worker thread; the dropdown fills in when done."""
+        # Daemon thread (like the PDF analysis) so a slow Outlook never holds up shutdown;
+        # the worker's signal is delivered queued on the GUI thread.
+        self._outlook_probe_worker = _OutlookProbeWorker(self.controller.email_service)
+        self._outlook_probe_worker.finished.connect(self._on_outlook_probe_finished)
+        threading.Thread(target=self._outlook_probe_worker.run, daemon=True).start()
+
+    def _on_outlook_probe_finished(self, info: dict):
+        # Back on the GUI thread: adopt plain data only (no COM objects cross threads)
         try:
-            accounts = self.controller.email_service.list_outlook_accounts()
+            self.controller.email_service.apply_probe_result(info)
         except Exception:
-            accounts = []
+            pass
+        self._refresh_outlook_accounts(info.get("accounts") or [])
+
+    def _refresh_outlook_accounts(self, accounts: Optional[List[dict]] = None):
+        """Populate the Outlook accounts dropdown and update status label."""
+        if accounts is None:
+            try:
+                accounts = self.controller.email_service.list_outlook_accounts()
+            except Exception:
+                accounts = []
         try:
             combo = self.outlook_accounts_combo
-            combo.blockSignals(True)
-            # Rebuild the list entirely (no "Default" entry)
-            while combo.count() > 0:
-                combo.removeItem(0)
-            for acc in accounts:
-                # Build compact label without duplicate email
-                display = acc.get("display_name") or ""
-                smtp = acc.get("smtp_address") or ""
-                if display and smtp:
-                    # Avoid duplication like "email — email"
-                    if display.strip().lower() == smtp.strip().lower():
-                        label = smtp
+            with QSignalBlocker(combo):
+                # Rebuild the list entirely (no "Default" entry)
+                combo.clear()
+                for acc in accounts:
+                    # Build compact label without duplicate email
+                    display = acc.get("display_name") or ""
+                    smtp = acc.get("smtp_address") or ""
+                    if display and smtp:
+                        # Avoid duplication like "email — email"
+                        if display.strip().lower() == smtp.strip().lower():
+                            label = smtp
+                        else:
+                            label = f"{display} — {smtp}"
                     else:
-                        label = f"{display} — {smtp}"
-                else:
-                    label = display or smtp or "Compte Outlook"
-                combo.addItem(label, userData=acc.get("id"))
-            # Selection behavior:
-            # - If a preferred account is known and still present, select it
-            # - Else select the first enumerated account (index 0) if any
-            try:
-                pref = self.controller.email_service.get_preferred_outlook_account()
-                if pref is not None:
-                    found = False
-                    for i in range(combo.count()):
-                        if str(combo.itemData(i)) == str(pref):
-                            combo.setCurrentIndex(i)
-                            found = True
-                            break
-                    if not found and combo.count() > 0:
-                        combo.setCurrentIndex(0)
-                else:
+                        label = display or smtp or "Compte Outlook"
+                    combo.addItem(label, userData=acc.get("id"))
+                # Selection behavior:
+                # - If a preferred account is known and still present, select it
+                # - Else select the first enumerated account (index 0) if any
+                try:
+                    pref = self.controller.email_service.get_preferred_outlook_account()
+                    if pref is not None:
+                        # Keyed lookup on item data (account ids are strings)
+                        idx = combo.findData(str(pref))
+                        if idx >= 0:
+                            combo.setCurrentIndex(idx)
+                        elif combo.count() > 0:
+                            combo.setCurrentIndex(0)
+                    else:
+                        if combo.count() > 0:
+                            combo.setCurrentIndex(0)
+                except Exception:
                     if combo.count() > 0:
                         combo.setCurrentIndex(0)
-            except Exception:
-                if combo.count() > 0:
-                    combo.setCurrentIndex(0)
-            combo.blockSignals(False)
         except Exception as e:
             print(f"[MainWindowQt] Failed to refresh Outlook accounts: {e}")
 
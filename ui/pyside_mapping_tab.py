@@ -1,7 +1,9 @@
 """PySide6 Mapping tab widget preserving behavior from Tkinter MappingTabComponent."""
 
-from typing import Optional, Callable, Set, List, Dict
-from PySide6.QtCore import Qt, QSize
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import AbstractSet, Optional, Callable, FrozenSet, List, Dict
+from PySide6.QtCore import Qt, QSize, QTimer, QSignalBlocker
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QListWidget, QListWidgetItem,
     QPushButton, QMessageBox, QInputDialog, QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QStyle,
@@ -11,6 +13,33 @@ from PySide6.QtGui import QIcon
 
 from services.mapping_service import MappingService
 
+# France time as a fixed UTC+2 offset
+_FR_TZ = timezone(timedelta(hours=2))
+
+
+@lru_cache(maxsize=256)
+def _format_last_sent(iso_s: str) -> str:
+    """Format a stored ISO 'Dernier envoi' timestamp in France time as 'YYYY-MM-DD HH:MM'."""
+    if not iso_s:
+        return ""
+    try:
+        s = iso_s.strip()
+        # Accept both with/without trailing 'Z' (stored values are UTC) and with fractional seconds
+        if s.endswith("Z"):
+            s = s[:-1]
+        dt = None
+        for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
+            try:
+                dt = datetime.strptime(s, fmt)
+                break
+            except Exception:
+                continue
+        if dt is None:
+            return iso_s  # fallback: raw
+        return dt.replace(tzinfo=timezone.utc).astimezone(_FR_TZ).strftime("%Y-%m-%d %H:%M")
+    except Exception:
+        return iso_s
+
 
 class MappingTabWidget(QWidget):
     """
@@ -29,7 +58,14 @@ class MappingTabWidget(QWidget):
         from services.stopover_email_service import StopoverEmailService
         self._email_service = StopoverEmailService()
 
-        self._found_codes: Set[str] = set()
+        self._found_codes: FrozenSet[str] = frozenset()
+        # Rows last written to the table; an identical reload leaves the table alone
+        self._last_render_key: Optional[tuple] = None
+        # Config notifications arrive in bursts (mappings, stopovers, last sent): reload once after them
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(50)
+        self._reload_timer.timeout.connect(self.load_mappings)
 
         self._build_ui()
 
@@ -113,103 +149,154 @@ class MappingTabWidget(QWidget):
         # Live refresh when config changes anywhere
         try:
             from services.config_manager import get_config_manager
-            get_config_manager().on_mappings_changed(lambda _: self.load_mappings())
+            mgr = get_config_manager()
+            mgr.on_mappings_changed(self.schedule_load_mappings)
+            mgr.on_stopovers_changed(self.schedule_load_mappings)
+            mgr.on_last_sent_changed(self.schedule_load_mappings)
         except Exception:
             pass
 
     # -------- Public API (parity) --------
 
+    def schedule_load_mappings(self, *_):
+        """Reload the table shortly; calls within the delay coalesce into one reload."""
+        self._reload_timer.start()
+
     def load_mappings(self):
         """Reload the table with stopover mappings + last sent + found status."""
+        self._reload_timer.stop()
         try:
             # Data sources
             # Unify with StopoverEmailService so edits from the email dialog are always reflected here.
-            from services.stopover_email_service import StopoverEmailService
-            ses = StopoverEmailService()
+            ses = self._email_service
             all_cfgs = ses.get_all_configs()  # { CODE: StopoverEmailConfig }
-            last_sent_map: Dict[str, str] = ses._manager.get_last_sent()  # raw dict access from manager
+            last_sent_map: Dict[str, str] = ses.get_all_last_sent()
 
             # Merge codes from unified configs (may include codes not in legacy mappings) and found in current PDF
-            all_codes = sorted(set((self._found_codes or set())) | set(all_cfgs.keys()))
-
-            # Build table
-            self.table.setRowCount(len(all_codes))
-            for row, code in enumerate(all_codes):
-                cfg = all_cfgs.get(code) or all_cfgs.get(str(code).upper())
-                to_list = list((cfg.recipients if cfg else []) or [])
-                cc_list = list((cfg.cc_recipients if cfg else []) or [])
-                bcc_list = list((cfg.bcc_recipients if cfg else []) or [])
-                emails_str = ", ".join(to_list) if to_list else ""
+            found = self._found_codes
+            all_codes = sorted(found | all_cfgs.keys())
+
+            # Loop invariants bound once for the per-row work below
+            get_cfg = all_cfgs.get
+            get_last = last_sent_map.get
+            fmt_last = _format_last_sent
+            rows: List[tuple] = []
+            append_row = rows.append
+            # Config keys are canonical (ConfigManager normalizes codes on ingress and on load)
+            # and detected codes are upper-case already: one lookup per code
+            for code in all_codes:
+                cfg = get_cfg(code)
+                if cfg:
+                    to_list = cfg.recipients or []
+                    cc_list = cfg.cc_recipients or []
+                    bcc_list = cfg.bcc_recipients or []
+                else:
+                    to_list = cc_list = bcc_list = []
+                emails_str = ", ".join(to_list)
                 ccbcc_parts = []
                 if cc_list:
                     ccbcc_parts.append(f"CC: {', '.join(cc_list)}")
                 if bcc_list:
                     ccbcc_parts.append(f"CCI: {', '.join(bcc_list)}")
                 ccbcc_str = " | ".join(ccbcc_parts)
-                last_raw = last_sent_map.get(code) or last_sent_map.get(str(code).upper()) or ""
-
-                # Format 'Dernier envoi' in local France time (UTC+2) as 'YYYY-MM-DD HH:MM'
-                def _format_last_sent(iso_s: str) -> str:
-                    if not iso_s:
-                        return ""
-                    try:
-                        from datetime import datetime, timedelta, timezone
-                        s = iso_s.strip()
-                        # Accept both with/without trailing 'Z' and with fractional seconds
-                        if s.endswith("Z"):
-                            s = s[:-1]
-                            tzinfo = timezone.utc
-                        else:
-                            tzinfo = timezone.utc
-                        # Try multiple patterns
-                        dt = None
-                        for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
-                            try:
-                                dt = datetime.strptime(s, fmt)
-                                break
-                            except Exception:
-                                continue
-                        if dt is None:
-                            return iso_s  # fallback: raw
-                        dt = dt.replace(tzinfo=tzinfo)
-                        # Convert to France time (fixed offset +2h as requested)
-                        dt_fr = dt.astimezone(timezone(timedelta(hours=2)))
-                        return dt_fr.strftime("%Y-%m-%d %H:%M")
-                    except Exception:
-                        return iso_s
-
-                last_display = _format_last_sent(last_raw)
-                status = "✓ Présente" if code in (self._found_codes or set()) else "○ Absente"
-
-                self.table.setItem(row, 0, QTableWidgetItem(code))
-                self.table.setItem(row, 1, QTableWidgetItem(last_display))
-                self.table.setItem(row, 2, QTableWidgetItem(emails_str))
-                self.table.setItem(row, 3, QTableWidgetItem(ccbcc_str))
-                self.table.setItem(row, 4, QTableWidgetItem(status))
-
-            # After populating, preserve current sort or default to code asc
-            header = self.table.horizontalHeader()
-            if self.table.isSortingEnabled():
-                try:
-                    section = header.sortIndicatorSection()
-                    order = header.sortIndicatorOrder()
-                except Exception:
-                    section = 0
-                    order = Qt.SortOrder.AscendingOrder
-                self.table.blockSignals(True)
-                try:
-                    self.table.sortItems(section, order)
-                finally:
-                    self.table.blockSignals(False)
-            else:
-                self.table.sortItems(0, Qt.SortOrder.AscendingOrder)
+                last_display = fmt_last(get_last(code) or "")
+                status = "✓ Présente" if code in found else "○ Absente"
+                append_row((code, last_display, emails_str, ccbcc_str, status))
+
+            # Same content as currently displayed: nothing to rewrite
+            render_key = tuple(rows)
+            if render_key == self._last_render_key and self.table.rowCount() == len(rows):
+                return
+            self._last_render_key = render_key
+
+            # Update the table in place, keyed by stopover code: only changed cells, new rows
+            # and removed rows are touched. Sorting is suspended meanwhile, otherwise every
+            # setItem/setText could move rows under the loop.
+            sorting = self.table.isSortingEnabled()
+            self.table.setUpdatesEnabled(False)
+            self.table.setSortingEnabled(False)
+            try:
+                self._apply_rows(rows)
+            finally:
+                # After populating, preserve current sort (re-enabling sorts by the header's
+                # indicator) or default to code asc
+                with QSignalBlocker(self.table):
+                    if sorting:
+                        self.table.setSortingEnabled(True)
+                    else:
+                        self.table.sortItems(0, Qt.SortOrder.AscendingOrder)
+                self.table.setUpdatesEnabled(True)
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Échec du chargement des correspondances : {str(e)}")
 
-    def set_found_stopovers(self, codes: Set[str]):
+    def _apply_rows(self, rows: List[tuple]):
+        """Make the table show rows (code first), reusing the items of codes already present."""
+        table = self.table
+        wanted = {values[0] for values in rows}
+        # Drop rows of codes that disappeared, bottom-up so indices stay valid
+        for r in range(table.rowCount() - 1, -1, -1):
+            item = table.item(r, 0)
+            if item is None or item.text() not in wanted:
+                table.removeRow(r)
+        row_of = {table.item(r, 0).text(): r for r in range(table.rowCount())}
+        for values in rows:
+            r = row_of.get(values[0])
+            if r is None:
+                r = table.rowCount()
+                table.insertRow(r)
+                for col, text in enumerate(values):
+                    table.setItem(r, col, QTableWidgetItem(text))
+                continue
+            for col in range(1, len(values)):
+                item = table.item(r, col)
+                if item is None:
+                    table.setItem(r, col, QTableWidgetItem(values[col]))
+                elif item.text() != values[col]:
+                    item.setText(values[col])
+
+    def set_found_stopovers(self, codes: AbstractSet[str]):
         """Set codes found by analysis to display and refresh the table."""
-        self._found_codes = set(codes or [])
-        self.load_mappings()
+        # frozenset() returns a frozenset argument itself: the controller's set is not copied
+        new = frozenset(codes or ())
+        old = self._found_codes
+        if new == old:
+            return
+        self._found_codes = new
+        # Only the status of codes that changed sides needs updating, as long as every such
+        # code already has a row and keeps one (a code leaving the PDF without a config goes away)
+        table = self.table
+        row_of = {}
+        for r in range(table.rowCount()):
+            item = table.item(r, 0)
+            if item is not None:
+                row_of[item.text()] = r
+        changed = new ^ old
+        try:
+            in_place = all(
+                code in row_of and (code in new or self._email_service.config_exists(code))
+                for code in changed
+            )
+        except Exception:
+            in_place = False
+        if not in_place:
+            self.load_mappings()
+            return
+        sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        try:
+            for code in changed:
+                status = "✓ Présente" if code in new else "○ Absente"
+                item = table.item(row_of[code], 4)
+                if item is None:
+                    table.setItem(row_of[code], 4, QTableWidgetItem(status))
+                else:
+                    item.setText(status)
+        finally:
+            if sorting:
+                with QSignalBlocker(table):
+                    table.setSortingEnabled(True)
+        # The table no longer matches the last full render; the next reload diffs it again
+        self._last_render_key = None
 
     # -------- Internal behavior --------
 
@@ -334,8 +421,7 @@ class MappingTabWidget(QWidget):
 
             # Remove mapping + stopover + last_sent from unified config
             try:
-                from services.stopover_email_service import StopoverEmailService
-                StopoverEmailService().delete_config(code)
+                self._email_service.delete_config(code)
             except Exception:
                 # Fallback direct removal to be extra safe
                 try:
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import List
 from PySide6 import QtWidgets, QtCore
 from PySide6.QtWidgets import (
     QDialog,
@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
 )
 from services.stopover_email_service import StopoverEmailService, StopoverEmailConfig
 from services.mapping_service import MappingService
+from ui.components.recipient_editor_dialog import split_emails
 
 
 class StopoverEmailSettingsDialog(QtWidgets.QDialog):
@@ -101,8 +102,8 @@ class StopoverEmailSettingsDialog(QtWidgets.QDialog):
 
         # Signals
         self.template_combo.currentIndexChanged.connect(self._update_preview)
+        # The preview shows subject and body only; recipient edits do not re-render it
         self.subject_edit.textChanged.connect(self._update_preview)
-        self.to_edit.textChanged.connect(self._update_preview)
 
     # ----- Data load/populate -----
     def _load_into_ui(self) -> None:
@@ -114,7 +115,7 @@ class StopoverEmailSettingsDialog(QtWidgets.QDialog):
         if not to_list:
             mapped = self._mapping.get_emails_for_stopover(self._stopover_code)
             if mapped:
-                to_list = mapped
+                to_list = list(mapped)
         self.to_edit.setText(self._join_emails(to_list))
         self.cc_edit.setText(self._join_emails(self._config.cc_recipients or []))
         self.bcc_edit.setText(self._join_emails(self._config.bcc_recipients or []))
@@ -137,9 +138,8 @@ class StopoverEmailSettingsDialog(QtWidgets.QDialog):
 
     @staticmethod
     def _split_emails(text: str) -> List[str]:
-        # Split by comma/semicolon and filter empties/spaces
-        parts = [p.strip() for p in re_split(r"[;,]", text or "")]
-        return [p for p in parts if p]
+        # Split by comma/semicolon, filter empties/spaces and repeated addresses
+        return split_emails(text)
 
     def _render_subject(self, subject_template: str) -> str:
         # Simple token replacement for {{stopover_code}}
@@ -158,7 +158,9 @@ class StopoverEmailSettingsDialog(QtWidgets.QDialog):
         lines.append(f"Sujet : {subj}")
         lines.append("")
         lines.append(body)
-        self.preview.setPlainText("\n".join(lines))
+        text = "\n".join(lines)
+        if text != self.preview.toPlainText():
+            self.preview.setPlainText(text)
 
     # ----- Validation/Persistence -----
     def _on_ok(self) -> None:
@@ -192,9 +194,3 @@ class StopoverEmailSettingsDialog(QtWidgets.QDialog):
             return
 
         self.accept()
-
-
-# Local, minimal regex split util (avoid importing 're' at module level users might not expect)
-import re
-def re_split(pattern: str, text: str) -> List[str]:
-    return re.split(pattern, text or "")
\ No newline at end of file
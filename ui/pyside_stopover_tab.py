@@ -1,17 +1,46 @@
 """PySide6 Stopover tab widget preserving behavior from Tkinter StopoverTabComponent."""
 
-from typing import List, Optional, Callable
-from PySide6.QtCore import Qt, QTimer, QSize, QEvent
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Tuple
+from PySide6.QtCore import Qt, QTimer, QSize, QEvent, Signal, Slot
 from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QListWidgetItem,
     QGroupBox, QLabel, QMessageBox, QSplitter, QSizePolicy
 )
 from PIL import Image
-from core.pdf_renderer import PDFRenderer
 from models.stopover import Stopover
+from ui.pdf_preview import PageRenderThread
 from utils.file_utils import validate_pdf_file
 
+# Fitted preview pixmaps kept per page (one per recent pane size)
+_PIXMAP_POOL_SIZE = 2
+
+# Rendered pages kept for the current PDF, so going back to a recent stopover skips the render
+_PAGE_CACHE_SIZE = 8
+
+
+def _to_qimage(img: Image.Image) -> QImage:
+    """Convert a PIL image to a QImage owning its pixels (safe to hand across threads)."""
+    if img.mode == "RGB":
+        return QImage(img.tobytes(), img.width, img.height, img.width * 3, QImage.Format_RGB888).copy()
+    img = img.convert("RGBA")
+    return QImage(img.tobytes(), img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+
+
+def _to_pixmap(img: Image.Image) -> QPixmap:
+    """
+    Convert a PIL image to a QPixmap on the GUI thread.
+
+    fromImage() copies the pixels before returning, so the QImage can wrap the PIL bytes
+    directly: one buffer per frame instead of the two _to_qimage() needs.
+    """
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    data = img.tobytes()
+    return QPixmap.fromImage(QImage(data, img.width, img.height, img.width * 3, QImage.Format_RGB888))
+
 
 class StopoverTabWidget(QWidget):
     """
@@ -24,15 +53,50 @@ class StopoverTabWidget(QWidget):
       - clear()
     """
 
+    # (token, (source, resized, area, grew), QImage or None) from the rescale thread
+    _rescaled = Signal(int, object, object)
+
     def __init__(self, on_stopover_select: Callable[[Stopover], None] = None, controller=None, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.on_stopover_select = on_stopover_select
         self.controller = controller
         self.stopovers: List[Stopover] = []
-        self.pdf_renderer: Optional[PDFRenderer] = None
+        # code -> first stopover with that code, for O(1) lookups from list items
+        self._by_code: Dict[str, Stopover] = {}
+        # Codes currently shown in stopover_list, in order
+        self._list_codes: List[str] = []
         self.current_pdf_path: Optional[str] = None
 
         self._last_rendered_image: Optional[Image.Image] = None
+        # Fitted pixmaps of the current page by pane area (see _device_area; LRU of _PIXMAP_POOL_SIZE), so
+        # toggling between two pane sizes (maximize/restore) does not resample again
+        self._pixmap_pool: "OrderedDict[Tuple[int, int, float], QPixmap]" = OrderedDict()
+        # Pane resizes arrive in bursts while dragging: a cheap bilinear fit at most every
+        # 30 ms while they keep coming, and the LANCZOS fit once they settle
+        self._interactive_resize_timer = QTimer(self)
+        self._interactive_resize_timer.setSingleShot(True)
+        self._interactive_resize_timer.setInterval(30)
+        self._interactive_resize_timer.timeout.connect(lambda: self._fit_and_update_preview(Image.BILINEAR))
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(250)
+        self._resize_timer.timeout.connect(self._fit_and_update_preview)
+        self._last_scheduled_size: Optional[QSize] = None
+        # Settled LANCZOS fits run on one background thread; only the latest token is shown
+        self._rescale_pool = ThreadPoolExecutor(max_workers=1)
+        self._rescale_token = 0
+        self._rescaled.connect(self._on_rescaled)
+
+        # Pages render on a persistent background thread; only the latest request is honored
+        self._render_thread = PageRenderThread(self)
+        self._render_thread.rendered.connect(self._on_page_rendered)
+        self._render_thread.failed.connect(self._on_page_render_failed)
+        self._pending_render_id: Optional[int] = None
+        # Page and target size of the last render; re-render only when the pane grows well past it
+        self._rendered_page: Optional[int] = None
+        self._rendered_target = 0
+        # page_number -> (target size, full render) for the current PDF, LRU of _PAGE_CACHE_SIZE
+        self._page_cache: "OrderedDict[int, Tuple[int, Image.Image]]" = OrderedDict()
 
         # Track a last used external progress callback so helper setters can use it reliably
         self._progress_callback: Optional[Callable[[str], None]] = None
@@ -116,10 +180,16 @@ class StopoverTabWidget(QWidget):
 
     def set_stopovers(self, stopovers: List[Stopover]):
         self.stopovers = stopovers
+        by_code: Dict[str, Stopover] = {}
+        for s in stopovers:
+            by_code.setdefault(s.code, s)
+        self._by_code = by_code
         self._update_stopover_list()
 
     def clear(self):
         self.stopovers = []
+        self._by_code = {}
+        self._list_codes = []
         self.current_pdf_path = None
         self.stopover_list.clear()
         self.preview_label.clear()
@@ -131,10 +201,14 @@ class StopoverTabWidget(QWidget):
     # -------- Internal behavior --------
 
     def _update_stopover_list(self):
+        codes = [s.code for s in self.stopovers]
+        if codes == self._list_codes:
+            # Same rows: keep the items (and the current selection) as they are
+            return
+        self._list_codes = codes
         self.stopover_list.clear()
-        for s in self.stopovers:
-            item = QListWidgetItem(s.code)
-            self.stopover_list.addItem(item)
+        # Single batched insert instead of one addItem per stopover
+        self.stopover_list.addItems(codes)
 
     # New: single-selection triggers preview callback
     def _on_selection_changed(self, current: Optional[QListWidgetItem], previous: Optional[QListWidgetItem]):
@@ -146,11 +220,7 @@ class StopoverTabWidget(QWidget):
                 self._set_status_no_selection()
                 return
             code = current.text()
-            selected = None
-            for s in self.stopovers:
-                if s.code == code:
-                    selected = s
-                    break
+            selected = self._by_code.get(code)
             if selected:
                 # If external handler provided, keep compatibility
                 if self.on_stopover_select:
@@ -169,11 +239,7 @@ class StopoverTabWidget(QWidget):
             return
         try:
             code = item.text()
-            selected = None
-            for s in self.stopovers:
-                if s.code == code:
-                    selected = s
-                    break
+            selected = self._by_code.get(code)
             if not selected:
                 QMessageBox.critical(self, "Erreur", "Escale sélectionnée introuvable")
                 return
@@ -196,67 +262,188 @@ class StopoverTabWidget(QWidget):
             self.preview_label.setText("Aucun aperçu")
             self._set_status_no_selection()
             return
-        try:
-            # Set loading immediately
-            self._set_status_loading()
-
-            if not self.pdf_renderer or self.pdf_renderer.pdf_path != self.current_pdf_path:
-                self.close_pdf_renderer()
-                self.pdf_renderer = PDFRenderer(self.current_pdf_path)
-
-            img = self.pdf_renderer.get_page_image(stopover.page_number, max_width=1600, max_height=1600)
-            self._last_rendered_image = img
-            # Update preview asynchronously to ensure the widget has sizes
-            QTimer.singleShot(0, self._fit_and_update_preview)
-            # Ensure final idle status after successful scheduling of UI update
-            QTimer.singleShot(0, self._set_status_idle)
-        except Exception as e:
-            # Error: update both preview text and status error
-            self.preview_label.setText("Aperçu indisponible")
-            self._set_status_error()
-            # Keep error message visible; do not immediately reset to idle
+        cached = self._page_cache.get(stopover.page_number)
+        if cached is not None and cached[0] >= self._render_target():
+            # Rendered recently at a size still large enough for the pane
+            self._page_cache.move_to_end(stopover.page_number)
+            self._pending_render_id = None
+            self._rendered_page = stopover.page_number
+            self._rendered_target = cached[0]
+            self._show_rendered(cached[1])
+            return
+        # Set loading immediately; the page renders off the UI thread
+        self._set_status_loading()
+        self._request_render(stopover.page_number)
+
+    def _device_area(self) -> Tuple[int, int, float]:
+        """Pane area available to the page in device pixels, and the device pixel ratio."""
+        dpr = self.preview_label.devicePixelRatioF() or 1.0
+        avail_w = max(1, int((self.preview_label.width() - 16) * dpr))
+        avail_h = max(1, int((self.preview_label.height() - 16) * dpr))
+        return avail_w, avail_h, dpr
+
+    def _render_target(self) -> int:
+        # Sized to what the pane shows on this screen (device pixels), with a 25% margin
+        # so small pane growth is still covered; at most the former 1600 px master per
+        # logical pixel
+        avail_w, avail_h, dpr = self._device_area()
+        return min(int(1600 * dpr), max(600, int(1.25 * max(avail_w, avail_h))))
+
+    def _request_render(self, page_number: int):
+        target = self._render_target()
+        self._rendered_page = page_number
+        self._rendered_target = target
+        self._pending_render_id = self._render_thread.request(
+            self.current_pdf_path, page_number, target, target, key=self
+        )
+
+    def _on_page_rendered(self, request_id: int, img):
+        # Ignore results superseded by a later selection
+        if request_id != self._pending_render_id:
+            return
+        self._pending_render_id = None
+        if self._rendered_page is not None:
+            self._page_cache[self._rendered_page] = (self._rendered_target, img)
+            self._page_cache.move_to_end(self._rendered_page)
+            while len(self._page_cache) > _PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+        self._show_rendered(img)
+
+    def _show_rendered(self, img: Image.Image):
+        self._last_rendered_image = img
+        self._pixmap_pool.clear()
+        self._fit_and_update_preview()
+        self._set_status_idle()
+
+    def _on_page_render_failed(self, request_id: int, message: str):
+        if request_id != self._pending_render_id:
+            return
+        self._pending_render_id = None
+        # Error: update both preview text and status error
+        self.preview_label.setText("Aperçu indisponible")
+        self._set_status_error()
+        # Keep error message visible; do not immediately reset to idle
 
     def eventFilter(self, watched, event):
         # Refit on container resize
         try:
             if watched is getattr(self, "_right_group", None) and event.type() == QEvent.Resize:
-                QTimer.singleShot(50, self._fit_and_update_preview)
+                size = event.size()
+                if size != self._last_scheduled_size:
+                    self._last_scheduled_size = size
+                    if not self._interactive_resize_timer.isActive():
+                        self._interactive_resize_timer.start()
+                    self._resize_timer.start()
         except Exception:
             pass
         return super().eventFilter(watched, event)
 
-    def _fit_and_update_preview(self):
+    def _fit_and_update_preview(self, resample=Image.LANCZOS):
+        """
+        Fit the current page image to the pane.
+
+        LANCZOS is the settled, kept result, computed on the rescale thread. Any other
+        filter gives a synchronous interactive (during-resize) fit that leaves the kept
+        image, the pixmap pool and the re-render decision to the settled pass.
+        """
         if self._last_rendered_image is None:
             return
+        interactive = resample != Image.LANCZOS
         try:
-            avail_w = max(1, self.preview_label.width() - 16)
-            avail_h = max(1, self.preview_label.height() - 16)
+            area = self._device_area()
+            avail_w, avail_h, dpr = area
+            pooled = self._pixmap_pool.get(area)
+            if pooled is not None:
+                # Already fitted at this size: no resampling
+                self._pixmap_pool.move_to_end(area)
+                self._show_pixmap(pooled)
+                return
             img = self._last_rendered_image
             iw, ih = img.size
             if iw <= 0 or ih <= 0:
                 return
             scale = min(avail_w / iw, avail_h / ih)
+            # Small slack so rounding from a previous shrink does not count as growth
+            grew = scale > 1.02
+            # The pane needs more pixels than are held (it grew past the last fit, or well
+            # past what was rasterized): render again at the new size
+            if (
+                not interactive
+                and (grew or self._render_target() > 1.5 * self._rendered_target)
+                and self._pending_render_id is None
+                and self._rendered_page is not None
+                and self.current_pdf_path
+            ):
+                self._request_render(self._rendered_page)
             target_w = max(1, int(iw * scale))
             target_h = max(1, int(ih * scale))
-            resized = img.resize((target_w, target_h), Image.LANCZOS)
-
-            # Convert PIL Image to QPixmap
-            qimg = QImage(resized.tobytes(), resized.width, resized.height, resized.width * 3, QImage.Format_RGB888) if resized.mode == "RGB" else None
-            if qimg is None:
-                resized = resized.convert("RGBA")
-                qimg = QImage(resized.tobytes(), resized.width, resized.height, resized.width * 4, QImage.Format_RGBA8888)
-            pix = QPixmap.fromImage(qimg)
-            self.preview_label.setPixmap(pix)
-            self.preview_label.setText("")
+            # A newer fit supersedes any settled rescale still running
+            self._rescale_token += 1
+            if interactive:
+                pix = _to_pixmap(img.resize((target_w, target_h), resample))
+                pix.setDevicePixelRatio(dpr)
+                self._show_pixmap(pix)
+                return
+            # Settled pass: LANCZOS off the GUI thread; only the QPixmap is made back here
+            self._rescale_pool.submit(
+                self._rescale_job, self._rescale_token, img, (target_w, target_h), area, grew
+            )
         except Exception:
-            self.preview_label.setText("Aperçu indisponible")
-            # Reflect error on status as well
-            self._set_status_error()
+            self._show_preview_error()
+
+    def _rescale_job(self, token: int, img: Image.Image, size: Tuple[int, int], area: Tuple[int, int, float], grew: bool):
+        """Runs on the rescale thread: reads img (never mutates it) and posts the result back."""
+        try:
+            if grew:
+                # Stretch for display until the larger render arrives
+                resized = img.resize(size, Image.LANCZOS)
+            else:
+                # reducing_gap: cheap box reduction first, LANCZOS only on the near-target image
+                resized = img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+            self._rescaled.emit(token, (img, resized, area, grew), _to_qimage(resized))
+        except Exception:
+            self._rescaled.emit(token, (img, None, area, grew), None)
+
+    @Slot(int, object, object)
+    def _on_rescaled(self, token: int, job: tuple, qimg: Optional[QImage]):
+        source, resized, area, grew = job
+        # Superseded by a newer fit, or the page changed meanwhile
+        if token != self._rescale_token or source is not self._last_rendered_image:
+            return
+        if qimg is None:
+            self._show_preview_error()
+            return
+        pix = QPixmap.fromImage(qimg)
+        # Device-pixel sized: shown 1:1 on HiDPI screens instead of being upscaled
+        pix.setDevicePixelRatio(area[2])
+        # Stretched fits are placeholders until the larger render arrives: neither kept nor pooled
+        if not grew:
+            # Keep the fitted image instead of the full-size render (frees the larger buffer)
+            self._last_rendered_image = resized
+            self._pixmap_pool[area] = pix
+            while len(self._pixmap_pool) > _PIXMAP_POOL_SIZE:
+                self._pixmap_pool.popitem(last=False)
+        self._show_pixmap(pix)
+
+    def _show_pixmap(self, pix: QPixmap):
+        # Already on screen: setPixmap would still relayout and repaint the label.
+        # (A label showing a pixmap has no text: setText replaces the pixmap.)
+        current = self.preview_label.pixmap()
+        if current is not None and not current.isNull() and current.cacheKey() == pix.cacheKey():
+            return
+        self.preview_label.setPixmap(pix)
+        self.preview_label.setText("")
+
+    def _show_preview_error(self):
+        self.preview_label.setText("Aperçu indisponible")
+        # Reflect error on status as well
+        self._set_status_error()
 
     def close_pdf_renderer(self):
-        if self.pdf_renderer:
-            try:
-                self.pdf_renderer.close()
-            except Exception:
-                pass
-            self.pdf_renderer = None
+        # Drop any in-flight preview and let the render thread close its document
+        self._pending_render_id = None
+        self._rendered_page = None
+        self._rendered_target = 0
+        self._pixmap_pool.clear()
+        self._page_cache.clear()
+        self._render_thread.release_document()
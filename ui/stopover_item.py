@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional, List, Callable
-from PySide6.QtCore import Qt, Signal, QSize
+from PySide6.QtCore import Qt, Signal, QSize, QSignalBlocker
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QGroupBox,
     QSplitter, QSizePolicy, QStyle
@@ -120,14 +120,9 @@ class StopoverItem(QWidget):
 
     def setTemplateValues(self, subject: str, body: str, is_override: bool = False):
         """Set initial template text. If override, show badge."""
-        self.subjectEdit.blockSignals(True)
-        self.bodyEdit.blockSignals(True)
-        try:
+        with QSignalBlocker(self.subjectEdit), QSignalBlocker(self.bodyEdit):
             self.subjectEdit.setPlainText(subject or "")
             self.bodyEdit.setPlainText(body or "")
-        finally:
-            self.subjectEdit.blockSignals(False)
-            self.bodyEdit.blockSignals(False)
         self.overrideLabel.setVisible(bool(is_override))
         self._validate()
 
@@ -85,7 +85,11 @@ class StopoverList(QWidget):
             item.setTemplateValues(subject, body, is_override=True)
 
     def select(self, codes: List[str]):
-        self._selected = set(codes)
+        selected = set(codes)
+        if selected == self._selected:
+            # Already the selection: no selectionChanged round-trip through the listeners
+            return
+        self._selected = selected
         self.selectionChanged.emit(list(self._selected))
 
     def filter(self, text: str, status: str):